@@ -2,14 +2,85 @@
 
 from __future__ import annotations
 
-import logging
 import hashlib
+import logging
+import string
+import uuid
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
 
 logger = logging.getLogger(__name__)
 
+# Bounds the wait for a fresh instance to reach "running" in launch(); the
+# 2s poll keeps the IP lag short and 30 attempts stays well inside the
+# orchestrator's timeout.
+_LAUNCH_WAITER_CONFIG = {"Delay": 2, "MaxAttempts": 30}
+
+# Cloud-init script that starts llama-server. Shell "$" is escaped as "$$".
+_USER_DATA_TEMPLATE = string.Template(
+    """#!/bin/bash
+set -euo pipefail
+
+log_step() {
+  printf '%s %s\\n' "$$(date -u +%Y-%m-%dT%H:%M:%SZ)" "$$*" | tee -a /var/log/zerollm-coldstart.log /var/log/vllm.log
+}
+
+log_step 'cloud_init_start model=${model_name}'
+
+# Write model config
+cat > /etc/zerollm-model.env << 'MODELEOF'
+MODEL_NAME=${model_id}
+VLLM_ARGS="${vllm_args}"
+MODELEOF
+log_step 'model_env_written model_id=${model_id}'
+
+# Configure CloudWatch Logs agent to stream vLLM logs
+INSTANCE_ID=$$(curl -sf --connect-timeout 3 http://169.254.169.254/latest/meta-data/instance-id 2>/dev/null || echo "unknown")
+if command -v /opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl >/dev/null 2>&1; then
+  cat > /opt/aws/amazon-cloudwatch-agent/etc/amazon-cloudwatch-agent.json << CWEOF
+{
+  "agent": {"run_as_user": "root"},
+  "logs": {
+    "logs_collected": {
+      "files": {
+        "collect_list": [
+          {
+            "file_path": "/var/log/vllm.log",
+            "log_group_name": "/zerollm/vllm",
+            "log_stream_name": "$$INSTANCE_ID/${model_name_safe}",
+            "timezone": "UTC",
+            "retention_in_days": 7
+          },
+          {
+            "file_path": "/var/log/zerollm-coldstart.log",
+            "log_group_name": "/zerollm/coldstart",
+            "log_stream_name": "$$INSTANCE_ID/${model_name_safe}",
+            "timezone": "UTC",
+            "retention_in_days": 7
+          }
+        ]
+      }
+    }
+  }
+}
+CWEOF
+  /opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl \
+    -a fetch-config -m ec2 -s \
+    -c file:/opt/aws/amazon-cloudwatch-agent/etc/amazon-cloudwatch-agent.json || true
+fi
+log_step 'cloudwatch_agent_configured'
+
+${fetch_model}
+
+# Start vLLM (assumes AMI has llama-server configured via systemd)
+log_step 'llama_service_start'
+systemctl enable vllm
+systemctl start vllm
+log_step 'cloud_init_done'
+"""
+)
+
 
 class EC2ComputeBackend:
     def __init__(
@@ -21,11 +92,14 @@ class EC2ComputeBackend:
         vllm_api_key: str = "",
         models_bucket: str = "",
         endpoint_url: str | None = None,
+        ec2_client=None,
     ):
-        kwargs = {}
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        self._ec2 = boto3.client("ec2", **kwargs)
+        if ec2_client is None:
+            kwargs = {}
+            if endpoint_url:
+                kwargs["endpoint_url"] = endpoint_url
+            ec2_client = boto3.client("ec2", **kwargs)
+        self._ec2 = ec2_client
         self._ami_id = ami_id
         self._security_group_id = security_group_id
         # Accept a single subnet ID or a comma-separated list for multi-AZ fallback.
@@ -33,6 +107,10 @@ class EC2ComputeBackend:
         self._instance_profile_arn = instance_profile_arn
         self._vllm_api_key = vllm_api_key
         self._models_bucket = models_bucket
+        # Hashed once; runtime_fingerprint() is consulted on every scale-up.
+        self._vllm_api_key_hash = (
+            hashlib.sha256(vllm_api_key.encode("utf-8")).hexdigest() if vllm_api_key else ""
+        )
 
     def launch(self, model_config: dict) -> tuple[str, str]:
         """Launch an EC2 GPU instance for the given model config.
@@ -46,6 +124,11 @@ class EC2ComputeBackend:
         for subnet_id in self._subnet_ids:
             try:
                 resp = self._ec2.run_instances(
+                    # botocore replays this token on its own retries (e.g. after
+                    # a read timeout), so EC2 returns the instance it already
+                    # launched instead of starting a second one. A new token per
+                    # subnet, since the parameters differ.
+                    ClientToken=uuid.uuid4().hex,
                     ImageId=self._ami_id,
                     InstanceType=model_config["instance_type"],
                     MinCount=1,
@@ -92,19 +175,19 @@ class EC2ComputeBackend:
         instance = resp["Instances"][0]
         instance_id = instance["InstanceId"]
 
-        # Public IP is used since Lambda runs outside the VPC.
-        # It may not be present in the run_instances response yet, so poll
-        # describe_instances until it appears (usually within a few seconds).
-        import time
+        # Public IP is used since Lambda runs outside the VPC. It is usually
+        # not in the run_instances response yet, and the router cannot reach
+        # the instance without it, so wait for "running" and read it once.
         public_ip = instance.get("PublicIpAddress", "")
         if not public_ip:
-            for _ in range(10):
-                time.sleep(2)
-                desc = self._ec2.describe_instances(InstanceIds=[instance_id])
-                public_ip = desc["Reservations"][0]["Instances"][0].get("PublicIpAddress", "")
-                if public_ip:
-                    break
-
+            try:
+                self._ec2.get_waiter("instance_running").wait(
+                    InstanceIds=[instance_id], WaiterConfig=_LAUNCH_WAITER_CONFIG
+                )
+                public_ip = self._public_ip(instance_id)
+            except WaiterError:
+                # check_health() backfills the IP from instance_status().
+                logger.warning("Instance %s not running yet; IP left for check_health", instance_id)
         return instance_id, public_ip
 
     def terminate(self, instance_id: str) -> None:
@@ -130,117 +213,71 @@ class EC2ComputeBackend:
 
     def runtime_fingerprint(self) -> dict:
         """Return non-secret runtime inputs that require a fresh instance when changed."""
-        api_key_hash = ""
-        if self._vllm_api_key:
-            api_key_hash = hashlib.sha256(self._vllm_api_key.encode("utf-8")).hexdigest()
         return {
             "backend": "aws-ec2",
             "ami_id": self._ami_id,
             "models_bucket": self._models_bucket,
-            "vllm_api_key_hash": api_key_hash,
+            "vllm_api_key_hash": self._vllm_api_key_hash,
         }
 
     def _public_ip(self, instance_id: str) -> str:
-        import time
-
-        public_ip = ""
-        for _ in range(10):
-            desc = self._ec2.describe_instances(InstanceIds=[instance_id])
-            public_ip = desc["Reservations"][0]["Instances"][0].get("PublicIpAddress", "")
-            if public_ip:
-                break
-            time.sleep(2)
-        return public_ip
+        # Called after the instance_running waiter, by which point EC2 has
+        # assigned the public IP; check_health() backfills it if not.
+        desc = self._ec2.describe_instances(InstanceIds=[instance_id])
+        return desc["Reservations"][0]["Instances"][0].get("PublicIpAddress", "")
 
     def _build_user_data(self, model_config: dict) -> str:
         """Build the cloud-init script that starts llama-server."""
-        vllm_args = model_config.get("vllm_args", "")
-        if self._vllm_api_key:
-            vllm_args = f"{vllm_args} --api-key {self._vllm_api_key}".strip()
         model_id = model_config.get("model_id") or model_config["name"]
-        model_name = model_config.get("name", model_id)
-        model_name_safe = model_name.replace("/", "_")
-
-        # If a models bucket and s3_key are present, download from S3 at boot.
-        # Writing fresh bytes to EBS runs at full provisioned throughput (1000 MB/s),
-        # bypassing the ~33 MB/s EBS snapshot lazy-initialization penalty.
-        s3_key = model_config.get("s3_key", "")
-        if self._models_bucket and s3_key:
-            fetch_model = (
-                f"log_step 'model_download_start bucket={self._models_bucket} key={s3_key}'\n"
-                f"mkdir -p /opt/models\n"
-                f"if test -s {model_id}; then\n"
-                f"  log_step 'model_download_skip_existing path={model_id} size_bytes='$(stat -c%s {model_id})\n"
-                f"else\n"
-                f"  aws s3 cp s3://{self._models_bucket}/{s3_key} {model_id} --no-progress\n"
-                f"  sync {model_id}\n"
-                f"fi\n"
-                f"log_step 'model_download_done path={model_id} size_bytes='$(stat -c%s {model_id})"
-            )
-        else:
-            fetch_model = (
-                f"log_step 'model_prebaked_expected path={model_id}'\n"
-                f"test -s {model_id}\n"
-                f"log_step 'model_prebaked_found path={model_id} size_bytes='$(stat -c%s {model_id})"
-            )
+        return _render_user_data(
+            model_name=model_config.get("name", model_id),
+            model_id=model_id,
+            vllm_args=model_config.get("vllm_args", ""),
+            s3_key=model_config.get("s3_key", ""),
+            models_bucket=self._models_bucket,
+            vllm_api_key=self._vllm_api_key,
+        )
 
-        return f"""#!/bin/bash
-set -euo pipefail
 
-log_step() {{
-  printf '%s %s\\n' "$(date -u +%Y-%m-%dT%H:%M:%SZ)" "$*" | tee -a /var/log/zerollm-coldstart.log /var/log/vllm.log
-}}
+def _render_user_data(
+    *,
+    model_name: str,
+    model_id: str,
+    vllm_args: str,
+    s3_key: str,
+    models_bucket: str,
+    vllm_api_key: str,
+) -> str:
+    """Render the cloud-init script from the module-level template."""
+    if vllm_api_key:
+        vllm_args = f"{vllm_args} --api-key {vllm_api_key}".strip()
 
-log_step 'cloud_init_start model={model_name}'
-
-# Write model config
-cat > /etc/zerollm-model.env << 'MODELEOF'
-MODEL_NAME={model_id}
-VLLM_ARGS="{vllm_args}"
-MODELEOF
-log_step 'model_env_written model_id={model_id}'
+    # If a models bucket and s3_key are present, download from S3 at boot.
+    # Writing fresh bytes to EBS runs at full provisioned throughput (1000 MB/s),
+    # bypassing the ~33 MB/s EBS snapshot lazy-initialization penalty.
+    if models_bucket and s3_key:
+        fetch_model = (
+            f"log_step 'model_download_start bucket={models_bucket} key={s3_key}'\n"
+            f"mkdir -p /opt/models\n"
+            f"if test -s {model_id}; then\n"
+            f"  log_step 'model_download_skip_existing path={model_id} size_bytes='$(stat -c%s {model_id})\n"
+            f"else\n"
+            f"  aws s3 cp s3://{models_bucket}/{s3_key} {model_id} --no-progress\n"
+            f"  sync {model_id}\n"
+            f"fi\n"
+            f"log_step 'model_download_done path={model_id} size_bytes='$(stat -c%s {model_id})"
+        )
+    else:
+        fetch_model = (
+            f"log_step 'model_prebaked_expected path={model_id}'\n"
+            f"test -s {model_id}\n"
+            f"log_step 'model_prebaked_found path={model_id} size_bytes='$(stat -c%s {model_id})"
+        )
 
-# Configure CloudWatch Logs agent to stream vLLM logs
-INSTANCE_ID=$(curl -sf --connect-timeout 3 http://169.254.169.254/latest/meta-data/instance-id 2>/dev/null || echo "unknown")
-if command -v /opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl >/dev/null 2>&1; then
-  cat > /opt/aws/amazon-cloudwatch-agent/etc/amazon-cloudwatch-agent.json << CWEOF
-{{
-  "agent": {{"run_as_user": "root"}},
-  "logs": {{
-    "logs_collected": {{
-      "files": {{
-        "collect_list": [
-          {{
-            "file_path": "/var/log/vllm.log",
-            "log_group_name": "/zerollm/vllm",
-            "log_stream_name": "$INSTANCE_ID/{model_name_safe}",
-            "timezone": "UTC",
-            "retention_in_days": 7
-          }},
-          {{
-            "file_path": "/var/log/zerollm-coldstart.log",
-            "log_group_name": "/zerollm/coldstart",
-            "log_stream_name": "$INSTANCE_ID/{model_name_safe}",
-            "timezone": "UTC",
-            "retention_in_days": 7
-          }}
-        ]
-      }}
-    }}
-  }}
-}}
-CWEOF
-  /opt/aws/amazon-cloudwatch-agent/bin/amazon-cloudwatch-agent-ctl \
-    -a fetch-config -m ec2 -s \
-    -c file:/opt/aws/amazon-cloudwatch-agent/etc/amazon-cloudwatch-agent.json || true
-fi
-log_step 'cloudwatch_agent_configured'
-
-{fetch_model}
-
-# Start vLLM (assumes AMI has llama-server configured via systemd)
-log_step 'llama_service_start'
-systemctl enable vllm
-systemctl start vllm
-log_step 'cloud_init_done'
-"""
+    return _USER_DATA_TEMPLATE.substitute(
+        model_name=model_name,
+        model_id=model_id,
+        vllm_args=vllm_args,
+        model_name_safe=model_name.replace("/", "_"),
+        fetch_model=fetch_model,
+    )
@@ -7,10 +7,14 @@ lives in control_plane/core/.
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
 import os
+import time
 from decimal import Decimal
+from types import MappingProxyType
+
+import orjson
 
 logging.basicConfig(
     level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO),
@@ -18,10 +22,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The DynamoDB resource is created during Lambda INIT so warm invocations
+# reuse it; every Python handler needs it. EC2 and Lambda clients are only
+# used by the orchestrator and cluster functions, and loading their service
+# models is a large share of client construction, so those are built on first
+# use. Outside AWS (no region/credentials) the session stays None and the
+# backends build their own clients.
+try:
+    import boto3
+    from botocore.config import Config
+
+    # Keep connections alive across invocations and fail fast on a stuck
+    # connect; adaptive retries absorb DynamoDB throttling.
+    _CLIENT_CONFIG = Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        connect_timeout=1,
+        read_timeout=3,
+    )
+    _SESSION = boto3.session.Session()
+    _DDB = _SESSION.resource("dynamodb", config=_CLIENT_CONFIG)
+except Exception:
+    _SESSION = _DDB = None
+
+
+def _aws_client(service_name: str, **config_overrides):
+    """Create a client from the shared session, or return None outside AWS."""
+    if _SESSION is None:
+        return None
+    config = _CLIENT_CONFIG
+    if config_overrides:
+        config = config.merge(Config(**config_overrides))
+    return _SESSION.client(service_name, config=config)
+
 
 # ---- Shared helpers ----
 
 _state_store = None
+_compute_backend = None
+_trigger_scale_up = None
+
+# Repeat scale-up triggers for a model within this window are dropped; the
+# orchestrator's scale_up is idempotent, so the extra invokes only cost time.
+SCALE_UP_COALESCE_SECONDS = 10
+_last_triggered: dict[str, float] = {}
 
 
 def _get_state_store():
@@ -35,47 +80,82 @@ def _get_state_store():
             instances_table=INSTANCES_TABLE(),
             models_table=MODELS_TABLE(),
             api_keys_table=API_KEYS_TABLE(),
+            dynamodb=_DDB,
         )
     return _state_store
 
 
 def _get_compute_backend():
-    """Build an EC2ComputeBackend from environment variables."""
-    import os
-    from control_plane.shared.config import get_env
-    from control_plane.backends.aws.compute import EC2ComputeBackend
-
-    return EC2ComputeBackend(
-        ami_id=get_env("GPU_AMI_ID"),
-        security_group_id=get_env("GPU_SECURITY_GROUP_ID"),
-        subnet_id=get_env("GPU_SUBNET_ID"),
-        instance_profile_arn=get_env("GPU_INSTANCE_PROFILE_ARN"),
-        vllm_api_key=os.environ.get("VLLM_API_KEY", ""),
-        models_bucket=os.environ.get("MODELS_BUCKET", ""),
-    )
+    """Return a cached EC2ComputeBackend built from environment variables."""
+    global _compute_backend
+    if _compute_backend is None:
+        from control_plane.shared.config import get_env
+        from control_plane.backends.aws.compute import EC2ComputeBackend
+
+        _compute_backend = EC2ComputeBackend(
+            ami_id=get_env("GPU_AMI_ID"),
+            security_group_id=get_env("GPU_SECURITY_GROUP_ID"),
+            subnet_id=get_env("GPU_SUBNET_ID"),
+            instance_profile_arn=get_env("GPU_INSTANCE_PROFILE_ARN"),
+            vllm_api_key=os.environ.get("VLLM_API_KEY", ""),
+            models_bucket=os.environ.get("MODELS_BUCKET", ""),
+            # RunInstances and StartInstances can take several seconds to respond.
+            ec2_client=_aws_client("ec2", read_timeout=30),
+        )
+    return _compute_backend
+
+
+# Shared read-only default for missing event sections.
+_EMPTY = MappingProxyType({})
+
+
+def _http_route(event) -> tuple[str, str]:
+    """Return (method, raw_path) from an API Gateway v2 event."""
+    request_context = event.get("requestContext") or _EMPTY
+    http = request_context.get("http") or _EMPTY
+    return http.get("method", ""), event.get("rawPath", "")
+
+
+def _authorizer_email(event) -> str:
+    """Return the email the Lambda authorizer attached to the request."""
+    request_context = event.get("requestContext") or _EMPTY
+    authorizer = request_context.get("authorizer") or _EMPTY
+    return (authorizer.get("lambda") or _EMPTY).get("email", "unknown@example.com")
 
 
 def _api_response(status_code: int, body: dict | str, headers: dict | None = None) -> dict:
     """Format an API Gateway v2 response."""
-    response_body = body if isinstance(body, str) else json.dumps(body, default=_json_default)
-    resp = {
+    response_body = body if isinstance(body, str) else _dumps(body)
+    return {
         "statusCode": status_code,
-        "headers": {"Content-Type": "application/json"},
+        "headers": {**_JSON_HEADERS, **headers} if headers else dict(_JSON_HEADERS),
         "body": response_body,
     }
-    if headers:
-        resp["headers"].update(headers)
-    return resp
+
+
+def _dumps(value) -> str:
+    """Serialize a response body to a JSON string."""
+    return orjson.dumps(value, default=_json_default).decode("utf-8")
 
 
 def _json_default(value):
-    """Serialize DynamoDB types that Python's JSON encoder does not handle."""
+    """Serialize DynamoDB types that the JSON encoder does not handle."""
     if isinstance(value, Decimal):
         # Preserve integer semantics when possible (e.g. Decimal("1") -> 1).
         return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        # String sets (e.g. active_request_starts); sorted for stable output.
+        return sorted(value)
     raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
 
 
+# Fixed response bodies, encoded once.
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+_NOT_FOUND_BODY = _dumps({"error": "not found"})
+_DELETED_BODY = _dumps({"deleted": True})
+_UNKNOWN_ACTION_BODY = _dumps({"error": "unknown action"})
+
+
 # ---- Phase 1: Orchestrator ----
 
 
@@ -94,61 +174,89 @@ def orchestrator_handler(event, context):
     action = event.get("action", "")
 
     if action == "scale_up":
-        import os
         model_name = event["model"]
-        result = scale_up(model_name, state, compute, vllm_api_key=os.environ.get("VLLM_API_KEY", ""))
-        return {"statusCode": 200, "body": json.dumps(result, default=_json_default)}
+        result = scale_up(model_name, state, compute)
+        return {"statusCode": 200, "body": _dumps(result)}
 
     elif action == "check_health":
-        import os
         result = check_health(state, compute, api_key=os.environ.get("VLLM_API_KEY", ""))
-        return {"statusCode": 200, "body": json.dumps(result, default=_json_default)}
+        return {"statusCode": 200, "body": _dumps(result)}
 
     elif action == "scale_down" or event.get("source") in ("schedule", "aws.events"):
         result = scale_down(state, compute)
-        return {"statusCode": 200, "body": json.dumps(result, default=_json_default)}
+        return {"statusCode": 200, "body": _dumps(result)}
 
     else:
         logger.warning("Unknown orchestrator event: %s", event)
-        return {"statusCode": 400, "body": json.dumps({"error": "unknown action"})}
+        return {"statusCode": 400, "body": _UNKNOWN_ACTION_BODY}
 
 
 def _make_trigger_scale_up():
-    """Return a callable that async-invokes the Orchestrator Lambda."""
-    import boto3
-    from control_plane.shared.config import ORCHESTRATOR_FUNCTION_NAME
-
-    client = boto3.client("lambda")
-    function_name = ORCHESTRATOR_FUNCTION_NAME()
-
-    def trigger(model_name: str):
-        client.invoke(
-            FunctionName=function_name,
-            InvocationType="Event",  # async
-            Payload=json.dumps({"action": "scale_up", "model": model_name}),
-        )
+    """Return a cached callable that async-invokes the Orchestrator Lambda.
 
-    return trigger
+    The callable returns False when the invoke was coalesced into a recent one.
+    """
+    global _trigger_scale_up
+    if _trigger_scale_up is None:
+        from control_plane.shared.config import ORCHESTRATOR_FUNCTION_NAME
+
+        client = _aws_client("lambda")
+        if client is None:
+            import boto3
+
+            client = boto3.client("lambda")
+        function_name = ORCHESTRATOR_FUNCTION_NAME()
+
+        def trigger(model_name: str) -> bool:
+            now = time.monotonic()
+            last = _last_triggered.get(model_name)
+            if last is not None and now - last < SCALE_UP_COALESCE_SECONDS:
+                logger.info("Scale-up for %s already triggered %.1fs ago", model_name, now - last)
+                return False
+            _last_triggered[model_name] = now
+            try:
+                client.invoke(
+                    FunctionName=function_name,
+                    InvocationType="Event",  # async
+                    Payload=_scale_up_payload(model_name),
+                )
+            except Exception:
+                # Let the next request retry instead of waiting out the window.
+                _last_triggered.pop(model_name, None)
+                raise
+            return True
+
+        _trigger_scale_up = trigger
+    return _trigger_scale_up
+
+
+@functools.lru_cache(maxsize=64)
+def _scale_up_payload(model_name: str) -> bytes:
+    """Return the encoded orchestrator scale-up event for a model."""
+    return orjson.dumps({"action": "scale_up", "model": model_name})
 
 
 # ---- Phase 3: Auth ----
 
+_BEARER = "Bearer "
+
 
 def authorizer_handler(event, context):
     """Lambda Authorizer (API Gateway v2 payload format 2.0, simple response)."""
     from control_plane.core.auth import validate_api_key
+    from control_plane.shared.config import AUTH_CACHE_TTL_SECONDS
 
-    state = _get_state_store()
-
-    headers = event.get("headers", {})
+    headers = event.get("headers") or _EMPTY
     auth_header = headers.get("authorization", "")
-    token = auth_header.replace("Bearer ", "", 1) if auth_header.startswith("Bearer ") else ""
+    token = auth_header[len(_BEARER):] if auth_header.startswith(_BEARER) else ""
 
     if not token:
         return {"isAuthorized": False}
 
     if token.startswith("zllm-"):
-        authorized, email = validate_api_key(token, state)
+        authorized, email = validate_api_key(
+            token, _get_state_store(), cache_ttl_seconds=AUTH_CACHE_TTL_SECONDS()
+        )
         if authorized:
             return {"isAuthorized": True, "context": {"email": email}}
         return {"isAuthorized": False}
@@ -163,19 +271,11 @@ def keys_handler(event, context):
 
     state = _get_state_store()
 
-    method = event.get("requestContext", {}).get("http", {}).get("method", "")
-    path = event.get("rawPath", "")
-
-    # Extract email from authorizer context
-    email = (
-        event.get("requestContext", {})
-        .get("authorizer", {})
-        .get("lambda", {})
-        .get("email", "unknown@example.com")
-    )
+    method, path = _http_route(event)
+    email = _authorizer_email(event)
 
     if method == "POST" and path == "/api/keys":
-        body = json.loads(event.get("body", "{}"))
+        body = orjson.loads(event.get("body", "{}"))
         name = body.get("name", "default")
         result = create_key(email, name, state)
         return _api_response(201, result)
@@ -185,11 +285,11 @@ def keys_handler(event, context):
         return _api_response(200, {"keys": result})
 
     if method == "DELETE" and "/api/keys/" in path:
-        key_id = event.get("pathParameters", {}).get("key_id", "")
+        key_id = (event.get("pathParameters") or _EMPTY).get("key_id", "")
         delete_key(key_id, email, state)
-        return _api_response(200, {"deleted": True})
+        return _api_response(200, _DELETED_BODY)
 
-    return _api_response(404, {"error": "not found"})
+    return _api_response(404, _NOT_FOUND_BODY)
 
 
 # ---- Phase 4: Cluster State ----
@@ -201,15 +301,14 @@ def cluster_handler(event, context):
 
     state = _get_state_store()
 
-    method = event.get("requestContext", {}).get("http", {}).get("method", "")
-    path = event.get("rawPath", "")
+    method, path = _http_route(event)
 
     if method == "GET" and path == "/api/cluster":
         result = get_cluster_state(state)
         return _api_response(200, result)
 
     if method == "POST" and path == "/api/cluster/scale":
-        body = json.loads(event.get("body", "{}"))
+        body = orjson.loads(event.get("body", "{}"))
         trigger = _make_trigger_scale_up()
         try:
             result = manual_scale(
@@ -222,4 +321,4 @@ def cluster_handler(event, context):
             return _api_response(400, {"error": str(exc)})
         return _api_response(200, result)
 
-    return _api_response(404, {"error": "not found"})
+    return _api_response(404, _NOT_FOUND_BODY)
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
+import logging
+import time
+from collections.abc import Sequence
+
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+
+logger = logging.getLogger(__name__)
+
+# Model configs only change when seed_models.py runs, so a warm Lambda can
+# serve list_model_configs() from memory for this long.
+MODEL_CONFIGS_TTL_SECONDS = 60
+
+# Expression placeholder names, precomputed for typical update sizes.
+_PLACEHOLDERS = tuple((f"#n{i}", f":v{i}") for i in range(16))
 
 
 class DynamoDBStateStore:
+    """State store over one boto3 DynamoDB resource.
+
+    The orchestrator and cluster view call this from worker threads. boto3
+    resources are not thread-safe in general; on the paths used here, the only
+    shared mutable state is the client's condition-expression builder, which
+    turns Key/Attr objects into placeholders with a counter that every call
+    resets. Every expression below is therefore written as a string, never as
+    a Key/Attr condition, leaving each call to the thread-safe low-level
+    client. Keep it that way, or give each thread its own resource.
+    """
+
     def __init__(
         self,
         instances_table: str,
@@ -14,16 +37,20 @@ class DynamoDBStateStore:
         api_keys_table: str,
         endpoint_url: str | None = None,
         region_name: str | None = None,
+        dynamodb=None,
     ):
-        kwargs = {}
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        if region_name:
-            kwargs["region_name"] = region_name
-        dynamodb = boto3.resource("dynamodb", **kwargs)
+        if dynamodb is None:
+            kwargs = {}
+            if endpoint_url:
+                kwargs["endpoint_url"] = endpoint_url
+            if region_name:
+                kwargs["region_name"] = region_name
+            dynamodb = boto3.resource("dynamodb", **kwargs)
         self._instances = dynamodb.Table(instances_table)
         self._models = dynamodb.Table(models_table)
         self._api_keys = dynamodb.Table(api_keys_table)
+        # fields -> (cached_at, configs)
+        self._model_configs_cache: dict[tuple[str, ...] | None, tuple[float, list[dict]]] = {}
 
     # --- Instances ---
 
@@ -32,65 +59,99 @@ class DynamoDBStateStore:
         return resp.get("Item")
 
     def list_instances(
-        self, *, model: str | None = None, status: str | None = None
+        self,
+        *,
+        model: str | None = None,
+        status: str | None = None,
+        fields: Sequence[str] | None = None,
+        last_request_before: int | None = None,
     ) -> list[dict]:
-        if model is not None and status is not None:
-            resp = self._instances.query(
-                IndexName="model-status-index",
-                KeyConditionExpression=Key("model").eq(model)
-                & Key("status").eq(status),
+        kwargs = _projection(fields)
+        names = kwargs.pop("ExpressionAttributeNames", {})
+        values = {}
+        if last_request_before is not None:
+            # Filtered server-side: the rows are still read, but not returned.
+            kwargs["FilterExpression"] = (
+                "attribute_not_exists(#last_request_at) OR #last_request_at < :last_request_before"
             )
-            return resp.get("Items", [])
+            names["#last_request_at"] = "last_request_at"
+            values[":last_request_before"] = last_request_before
 
+        key_conditions = []
         if model is not None:
-            resp = self._instances.query(
-                IndexName="model-status-index",
-                KeyConditionExpression=Key("model").eq(model),
-            )
-            return resp.get("Items", [])
-
+            key_conditions.append("#model = :model")
+            names["#model"] = "model"
+            values[":model"] = model
         if status is not None:
-            resp = self._instances.scan(
-                FilterExpression=Attr("status").eq(status),
-            )
-            return resp.get("Items", [])
+            key_conditions.append("#status = :status")
+            names["#status"] = "status"
+            values[":status"] = status
 
-        resp = self._instances.scan()
-        return resp.get("Items", [])
+        if names:
+            kwargs["ExpressionAttributeNames"] = names
+        if values:
+            kwargs["ExpressionAttributeValues"] = values
+
+        if not key_conditions:
+            return _scan_all(self._instances, **kwargs)
+        return _query_all(
+            self._instances,
+            IndexName="model-status-index" if model is not None else "status-index",
+            KeyConditionExpression=" AND ".join(key_conditions),
+            **kwargs,
+        )
 
     def put_instance(self, instance: dict) -> None:
         self._instances.put_item(Item=instance)
 
     def update_instance(self, instance_id: str, **fields) -> None:
-        update_parts = []
-        values = {}
-        names = {}
-        for i, (k, v) in enumerate(fields.items()):
-            placeholder = f":v{i}"
-            name_placeholder = f"#n{i}"
-            update_parts.append(f"{name_placeholder} = {placeholder}")
-            values[placeholder] = v
-            names[name_placeholder] = k
-
-        self._instances.update_item(
-            Key={"instance_id": instance_id},
-            UpdateExpression="SET " + ", ".join(update_parts),
+        expression, names, values = _set_expression(fields)
+        self._update_existing_instance(
+            instance_id,
+            UpdateExpression=expression,
             ExpressionAttributeValues=values,
             ExpressionAttributeNames=names,
         )
 
+    def update_instance_if_status(self, instance_id: str, expected_status: str, **fields) -> bool:
+        expression, names, values = _set_expression(fields)
+        try:
+            self._instances.update_item(
+                Key={"instance_id": instance_id},
+                UpdateExpression=expression,
+                # A status match also implies the row exists.
+                ConditionExpression="#expected_status = :expected_status",
+                ExpressionAttributeNames={**names, "#expected_status": "status"},
+                ExpressionAttributeValues={**values, ":expected_status": expected_status},
+            )
+            return True
+        except self._instances.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
 
     def remove_instance_fields(self, instance_id: str, *fields: str) -> None:
         if not fields:
             return
 
-        names = {f"#n{i}": field for i, field in enumerate(fields)}
-        self._instances.update_item(
-            Key={"instance_id": instance_id},
+        names = {
+            name_placeholder: field
+            for (name_placeholder, _), field in zip(_placeholders(len(fields)), fields)
+        }
+        self._update_existing_instance(
+            instance_id,
             UpdateExpression="REMOVE " + ", ".join(names.keys()),
             ExpressionAttributeNames=names,
         )
 
+    def _update_existing_instance(self, instance_id: str, **kwargs) -> None:
+        # update_item upserts by default; never recreate a row that was deleted.
+        try:
+            self._instances.update_item(
+                Key={"instance_id": instance_id},
+                ConditionExpression="attribute_exists(instance_id)",
+                **kwargs,
+            )
+        except self._instances.meta.client.exceptions.ConditionalCheckFailedException:
+            logger.warning("Skipping update for missing instance %s", instance_id)
 
     def delete_instance(self, instance_id: str) -> None:
         self._instances.delete_item(Key={"instance_id": instance_id})
@@ -99,7 +160,9 @@ class DynamoDBStateStore:
         try:
             self._instances.put_item(
                 Item=instance,
-                ConditionExpression="attribute_not_exists(instance_id)",
+                ConditionExpression="attribute_not_exists(instance_id) OR #status = :terminated",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":terminated": "terminated"},
             )
             return True
         except self._instances.meta.client.exceptions.ConditionalCheckFailedException:
@@ -112,9 +175,25 @@ class DynamoDBStateStore:
         resp = self._models.get_item(Key={"name": model_name})
         return resp.get("Item")
 
-    def list_model_configs(self) -> list[dict]:
-        resp = self._models.scan()
-        return resp.get("Items", [])
+    def list_model_configs(
+        self, *, fields: Sequence[str] | None = None, cached: bool = True
+    ) -> list[dict]:
+        if not cached:
+            return _scan_all(self._models, **_projection(fields))
+        cache_key = tuple(fields) if fields is not None else None
+        now = time.monotonic()
+        cached = self._model_configs_cache.get(cache_key)
+        if cached is not None:
+            cached_at, configs = cached
+            if now - cached_at < MODEL_CONFIGS_TTL_SECONDS:
+                return list(configs)
+        configs = _scan_all(self._models, **_projection(fields))
+        self._model_configs_cache[cache_key] = (now, configs)
+        return list(configs)
+
+    def put_model_config(self, config: dict) -> None:
+        self._models.put_item(Item=config)
+        self._model_configs_cache.clear()
 
     # --- API Keys ---
 
@@ -129,8 +208,67 @@ class DynamoDBStateStore:
         self._api_keys.delete_item(Key={"key_hash": key_hash})
 
     def list_api_keys(self, email: str) -> list[dict]:
-        resp = self._api_keys.query(
-            IndexName="email-index",
-            KeyConditionExpression=Key("email").eq(email),
+        return _query_all(
+            self._api_keys,
+            IndexName="email-created-index",
+            KeyConditionExpression="#email = :email",
+            ExpressionAttributeNames={"#email": "email"},
+            ExpressionAttributeValues={":email": email},
+            ScanIndexForward=False,
         )
-        return resp.get("Items", [])
+
+
+def _projection(fields: Sequence[str] | None) -> dict:
+    """Build ProjectionExpression kwargs for a read limited to ``fields``."""
+    if fields is None:
+        return {}
+    # Alias every attribute: "status" and "name" are DynamoDB reserved words.
+    names = {f"#p{i}": field for i, field in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _set_expression(fields: dict) -> tuple[str, dict, dict]:
+    """Build (UpdateExpression, names, values) that SET each of ``fields``."""
+    if len(fields) == 1:
+        ((name, value),) = fields.items()
+        return "SET #n0 = :v0", {"#n0": name}, {":v0": value}
+
+    update_parts = []
+    values = {}
+    names = {}
+    for (name_placeholder, placeholder), (k, v) in zip(
+        _placeholders(len(fields)), fields.items()
+    ):
+        update_parts.append(f"{name_placeholder} = {placeholder}")
+        values[placeholder] = v
+        names[name_placeholder] = k
+    return "SET " + ", ".join(update_parts), names, values
+
+
+def _placeholders(count: int):
+    if count <= len(_PLACEHOLDERS):
+        return _PLACEHOLDERS[:count]
+    return [(f"#n{i}", f":v{i}") for i in range(count)]
+
+
+def _query_all(table, **kwargs) -> list[dict]:
+    """Run a query and follow LastEvaluatedKey until every page is read."""
+    resp = table.query(**kwargs)
+    items = resp.get("Items", [])
+    while "LastEvaluatedKey" in resp:
+        resp = table.query(ExclusiveStartKey=resp["LastEvaluatedKey"], **kwargs)
+        items.extend(resp.get("Items", []))
+    return items
+
+
+def _scan_all(table, **kwargs) -> list[dict]:
+    """Run a scan and follow LastEvaluatedKey until every page is read."""
+    resp = table.scan(**kwargs)
+    items = resp.get("Items", [])
+    while "LastEvaluatedKey" in resp:
+        resp = table.scan(ExclusiveStartKey=resp["LastEvaluatedKey"], **kwargs)
+        items.extend(resp.get("Items", []))
+    return items
@@ -11,6 +11,11 @@ const {
 const { InvokeCommand, LambdaClient } = require("@aws-sdk/client-lambda");
 
 const VLLM_PORT = 8000;
+const PROXY_PATHS = new Set([
+  "/v1/messages",
+  "/v1/responses",
+  "/v1/chat/completions",
+]);
 const JSON_HEADERS = {
   "Content-Type": "application/json",
   "Access-Control-Allow-Origin": "*",
@@ -18,16 +23,77 @@ const JSON_HEADERS = {
   "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
 };
 
+// One jittered retry of the vLLM POST, only when vLLM cannot have started
+// generating: it answered 503 (e.g. under KV-cache pressure), or the
+// connection was never established. A reset after the request was sent is
+// not retried, since vLLM may already be generating for it.
+const UPSTREAM_RETRY_DELAY_MS = 50;
+const UPSTREAM_RETRY_JITTER_MS = 20;
+// err.cause.code values from undici for connections that never completed.
+const UPSTREAM_CONNECT_ERROR_CODES = new Set([
+  "ECONNREFUSED",
+  "EHOSTUNREACH",
+  "ENETUNREACH",
+  "UND_ERR_CONNECT_TIMEOUT",
+]);
+
 const dynamodb = new DynamoDBClient({});
 const lambda = new LambdaClient({});
 
+// Routable instance per model, reused by a warm container for a short window.
+// The ready set changes on scale-up/scale-down timescales, and beginRequest()
+// re-checks the status, so a stale entry only costs one fresh lookup.
+// In-memory windows use the monotonic performance.now(); only timestamps
+// stored in DynamoDB use wall-clock time.
+const ROUTABLE_CACHE_TTL_MS = 2000;
+const routableCache = new Map();
+
+// The model catalog only changes when models are seeded; serve the encoded
+// /v1/models body and the set of known model names from memory for this long.
+const MODELS_CACHE_TTL_MS = 30000;
+let modelsCache = null;
+
+// A burst of requests against a cold model would otherwise invoke the
+// orchestrator once per 503. Same window as SCALE_UP_COALESCE_SECONDS in
+// handlers.py, which explains why dropping the repeats is safe.
+const SCALE_UP_COALESCE_MS = 10000;
+const lastTriggered = new Map();
+
+// Preflight and error bodies that never vary per request. The 502 embeds the
+// failure message, so it is still built with writeJson().
+const EMPTY_BODY = "{}";
+const NOT_FOUND_BODY = JSON.stringify({ error: "not found" });
+const UNAUTHORIZED_BODY = JSON.stringify({
+  error: { message: "unauthorized", type: "authentication_error" },
+});
+const MODEL_REQUIRED_BODY = JSON.stringify({
+  error: { message: "model is required", type: "invalid_request_error" },
+});
+const COLD_START_BODY = JSON.stringify({
+  error: {
+    message: "Model is cold-starting. Retry shortly.",
+    type: "service_unavailable",
+  },
+});
+const WARM_START_BODY = JSON.stringify({
+  error: {
+    message: "Model is warm-starting. Retry shortly.",
+    type: "service_unavailable",
+  },
+});
+const RETRY_AFTER_HEADERS = { "Retry-After": "30" };
+
 function response(stream, statusCode, headers = JSON_HEADERS) {
   return awslambda.HttpResponseStream.from(stream, { statusCode, headers });
 }
 
 function writeJson(stream, statusCode, body, headers = {}) {
+  writeJsonText(stream, statusCode, JSON.stringify(body), headers);
+}
+
+function writeJsonText(stream, statusCode, text, headers = {}) {
   const out = response(stream, statusCode, { ...JSON_HEADERS, ...headers });
-  out.write(JSON.stringify(body));
+  out.write(text);
   out.end();
 }
 
@@ -64,6 +130,23 @@ async function validateApiKey(token) {
   return crypto.timingSafeEqual(Buffer.from(storedHash), Buffer.from(keyHash));
 }
 
+async function modelCatalog({ fresh = false } = {}) {
+  if (
+    !fresh &&
+    modelsCache &&
+    performance.now() - modelsCache.cachedAt < MODELS_CACHE_TTL_MS
+  ) {
+    return modelsCache;
+  }
+  const models = await listModels();
+  modelsCache = {
+    cachedAt: performance.now(),
+    body: JSON.stringify(models),
+    names: new Set(models.data.map((model) => model.id)),
+  };
+  return modelsCache;
+}
+
 async function listModels() {
   const result = await dynamodb.send(
     new ScanCommand({
@@ -129,34 +212,53 @@ async function instanceByStatus(model, status) {
 }
 
 async function triggerScaleUp(model) {
-  await lambda.send(
-    new InvokeCommand({
-      FunctionName: process.env.ORCHESTRATOR_FUNCTION_NAME,
-      InvocationType: "Event",
-      Payload: Buffer.from(JSON.stringify({ action: "scale_up", model })),
-    })
-  );
+  const now = performance.now();
+  const last = lastTriggered.get(model);
+  if (last !== undefined && now - last < SCALE_UP_COALESCE_MS) return;
+  lastTriggered.set(model, now);
+
+  try {
+    await lambda.send(
+      new InvokeCommand({
+        FunctionName: process.env.ORCHESTRATOR_FUNCTION_NAME,
+        InvocationType: "Event",
+        Payload: Buffer.from(JSON.stringify({ action: "scale_up", model })),
+      })
+    );
+  } catch (err) {
+    // Let the next request retry instead of waiting out the window.
+    lastTriggered.delete(model);
+    throw err;
+  }
 }
 
 async function beginRequest(instanceId) {
   const now = Math.floor(Date.now() / 1000);
   const token = `${now}:${crypto.randomUUID()}`;
-  await dynamodb.send(
-    new UpdateItemCommand({
-      TableName: process.env.INSTANCES_TABLE,
-      Key: { instance_id: { S: instanceId } },
-      UpdateExpression:
-        "SET #status = :busy, last_request_at = :now ADD active_request_starts :token",
-      ExpressionAttributeNames: {
-        "#status": "status",
-      },
-      ExpressionAttributeValues: {
-        ":busy": { S: "busy" },
-        ":now": { N: String(now) },
-        ":token": { SS: [token] },
-      },
-    })
-  );
+  try {
+    await dynamodb.send(
+      new UpdateItemCommand({
+        TableName: process.env.INSTANCES_TABLE,
+        Key: { instance_id: { S: instanceId } },
+        UpdateExpression:
+          "SET #status = :busy, last_request_at = :now ADD active_request_starts :token",
+        ConditionExpression: "#status IN (:ready, :busy)",
+        ExpressionAttributeNames: {
+          "#status": "status",
+        },
+        ExpressionAttributeValues: {
+          ":ready": { S: "ready" },
+          ":busy": { S: "busy" },
+          ":now": { N: String(now) },
+          ":token": { SS: [token] },
+        },
+      })
+    );
+  } catch (err) {
+    // The instance left ready/busy (e.g. scale-down began stopping it).
+    if (err.name === "ConditionalCheckFailedException") return null;
+    throw err;
+  }
   return token;
 }
 
@@ -171,28 +273,36 @@ async function endRequest(instanceId, requestToken) {
         ":now": { N: String(Math.floor(Date.now() / 1000)) },
         ":token": { SS: [requestToken] },
       },
-      ReturnValues: "ALL_NEW",
+      // Only the remaining markers are needed, not the whole item.
+      ReturnValues: "UPDATED_NEW",
     })
   );
 
   const activeStarts = result.Attributes?.active_request_starts?.SS || [];
   if (activeStarts.length > 0) return;
 
-  await dynamodb.send(
-    new UpdateItemCommand({
-      TableName: process.env.INSTANCES_TABLE,
-      Key: { instance_id: { S: instanceId } },
-      UpdateExpression:
-        "SET #status = :ready, last_request_at = :now REMOVE active_request_starts",
-      ExpressionAttributeNames: {
-        "#status": "status",
-      },
-      ExpressionAttributeValues: {
-        ":ready": { S: "ready" },
-        ":now": { N: String(Math.floor(Date.now() / 1000)) },
-      },
-    })
-  );
+  // last_request_at was just written above. The condition skips the flip
+  // back to ready if another request began in between.
+  try {
+    await dynamodb.send(
+      new UpdateItemCommand({
+        TableName: process.env.INSTANCES_TABLE,
+        Key: { instance_id: { S: instanceId } },
+        UpdateExpression: "SET #status = :ready",
+        ConditionExpression:
+          "#status = :busy AND attribute_not_exists(active_request_starts)",
+        ExpressionAttributeNames: {
+          "#status": "status",
+        },
+        ExpressionAttributeValues: {
+          ":ready": { S: "ready" },
+          ":busy": { S: "busy" },
+        },
+      })
+    );
+  } catch (err) {
+    if (err.name !== "ConditionalCheckFailedException") throw err;
+  }
 }
 
 async function markInstanceReady(instanceId) {
@@ -248,6 +358,38 @@ async function routableInstance(model) {
   return null;
 }
 
+async function claimInstance(model) {
+  const cached = routableCache.get(model);
+  if (cached && performance.now() - cached.cachedAt < ROUTABLE_CACHE_TTL_MS) {
+    const requestToken = await beginRequest(cached.instance.instanceId);
+    if (requestToken) return { instance: cached.instance, requestToken };
+  }
+  routableCache.delete(model);
+
+  const instance = await routableInstance(model);
+  if (!instance) return null;
+
+  const requestToken = await beginRequest(instance.instanceId);
+  if (!requestToken) return null;
+
+  routableCache.set(model, { cachedAt: performance.now(), instance });
+  return { instance, requestToken };
+}
+
+async function fetchUpstream(url, init) {
+  try {
+    const upstream = await fetch(url, init);
+    if (upstream.status !== 503) return upstream;
+    await upstream.body?.cancel();
+  } catch (err) {
+    if (!UPSTREAM_CONNECT_ERROR_CODES.has(err.cause?.code)) throw err;
+  }
+  const delay =
+    UPSTREAM_RETRY_DELAY_MS + Math.random() * UPSTREAM_RETRY_JITTER_MS;
+  await new Promise((resolve) => setTimeout(resolve, delay));
+  return fetch(url, init);
+}
+
 async function warmStartPending(model) {
   const starting = await startingInstance(model);
   if (starting?.previousIp || starting?.stoppedAt || starting?.warmExpiresAt) {
@@ -269,33 +411,42 @@ async function proxyStreaming(event, stream, path) {
   const model = body.model || "";
 
   if (!model) {
-    writeJson(stream, 400, {
-      error: { message: "model is required", type: "invalid_request_error" },
+    writeJsonText(stream, 400, MODEL_REQUIRED_BODY);
+    return;
+  }
+
+  // Unknown models would otherwise fall through to a cold-start 503 that
+  // never resolves, after several instance lookups and a scale-up invoke.
+  // A miss re-reads the catalog, so a just-seeded model is never rejected
+  // by a stale cache; the cache only speeds up the hit path.
+  if (
+    !(await modelCatalog()).names.has(model) &&
+    !(await modelCatalog({ fresh: true })).names.has(model)
+  ) {
+    writeJson(stream, 404, {
+      error: {
+        message: `The model '${model}' does not exist`,
+        type: "invalid_request_error",
+        code: "model_not_found",
+      },
     });
     return;
   }
 
-  const instance = await routableInstance(model);
-  if (!instance) {
+  const claim = await claimInstance(model);
+  if (!claim) {
     const isWarmStart = await warmStartPending(model);
     await triggerScaleUp(model);
-    writeJson(
+    writeJsonText(
       stream,
       503,
-      {
-        error: {
-          message: isWarmStart
-            ? "Model is warm-starting. Retry shortly."
-            : "Model is cold-starting. Retry shortly.",
-          type: "service_unavailable",
-        },
-      },
-      { "Retry-After": "30" }
+      isWarmStart ? WARM_START_BODY : COLD_START_BODY,
+      RETRY_AFTER_HEADERS
     );
     return;
   }
 
-  const requestToken = await beginRequest(instance.instanceId);
+  const { instance, requestToken } = claim;
 
   try {
     const upstreamHeaders = { "Content-Type": "application/json" };
@@ -303,11 +454,16 @@ async function proxyStreaming(event, stream, path) {
       upstreamHeaders.Authorization = `Bearer ${process.env.VLLM_API_KEY}`;
     }
 
-    const upstream = await fetch(`http://${instance.ip}:${VLLM_PORT}${path}`, {
-      method: "POST",
-      headers: upstreamHeaders,
-      body: bodyText,
-    });
+    let upstream;
+    try {
+      upstream = await fetchUpstream(
+        `http://${instance.ip}:${VLLM_PORT}${path}`,
+        { method: "POST", headers: upstreamHeaders, body: bodyText }
+      );
+    } catch (err) {
+      routableCache.delete(model);
+      throw err;
+    }
 
     const contentType =
       upstream.headers.get("content-type") || "application/json";
@@ -340,32 +496,27 @@ exports.handler = awslambda.streamifyResponse(async (event, stream) => {
 
   try {
     if (method === "OPTIONS") {
-      writeJson(stream, 200, {});
+      writeJsonText(stream, 200, EMPTY_BODY);
       return;
     }
 
     const token = bearerToken(event);
     if (!(await validateApiKey(token))) {
-      writeJson(stream, 401, {
-        error: { message: "unauthorized", type: "authentication_error" },
-      });
+      writeJsonText(stream, 401, UNAUTHORIZED_BODY);
       return;
     }
 
     if (method === "GET" && path === "/v1/models") {
-      writeJson(stream, 200, await listModels());
+      writeJsonText(stream, 200, (await modelCatalog()).body);
       return;
     }
 
-    if (
-      method === "POST" &&
-      ["/v1/messages", "/v1/responses", "/v1/chat/completions"].includes(path)
-    ) {
+    if (method === "POST" && PROXY_PATHS.has(path)) {
       await proxyStreaming(event, stream, path);
       return;
     }
 
-    writeJson(stream, 404, { error: "not found" });
+    writeJsonText(stream, 404, NOT_FOUND_BODY);
   } catch (err) {
     console.error("Streaming router failed", err);
     writeJson(stream, 502, {
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import logging
+from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
 
 class InMemoryStateStore:
     def __init__(self):
         self._instances: dict[str, dict] = {}
+        # Secondary indexes mirroring the DynamoDB GSIs: value -> ordered set of IDs.
+        self._by_model: dict[str, dict[str, None]] = {}
+        self._by_status: dict[str, dict[str, None]] = {}
         self._models: dict[str, dict] = {}
         self._api_keys: dict[str, dict] = {}
 
@@ -15,48 +23,97 @@ class InMemoryStateStore:
         return self._instances.get(instance_id)
 
     def list_instances(
-        self, *, model: str | None = None, status: str | None = None
+        self,
+        *,
+        model: str | None = None,
+        status: str | None = None,
+        fields: Sequence[str] | None = None,
+        last_request_before: int | None = None,
     ) -> list[dict]:
-        results = list(self._instances.values())
-        if model is not None:
-            results = [i for i in results if i.get("model") == model]
-        if status is not None:
-            results = [i for i in results if i.get("status") == status]
-        return results
+        if model is None and status is None:
+            records = list(self._instances.values())
+            return _project(_requested_before(records, last_request_before), fields)
+
+        if model is None:
+            ids = self._by_status.get(status, {})
+        elif status is None:
+            ids = self._by_model.get(model, {})
+        else:
+            by_model = self._by_model.get(model, {})
+            by_status = self._by_status.get(status, {})
+            smaller, larger = sorted((by_model, by_status), key=len)
+            ids = [i for i in smaller if i in larger]
+        records = [self._instances[i] for i in ids]
+        return _project(_requested_before(records, last_request_before), fields)
 
     def put_instance(self, instance: dict) -> None:
-        self._instances[instance["instance_id"]] = instance
+        instance_id = instance["instance_id"]
+        existing = self._instances.get(instance_id)
+        if existing is not None:
+            self._unindex(instance_id, existing)
+        self._instances[instance_id] = instance
+        self._index(instance_id, instance)
 
     def update_instance(self, instance_id: str, **fields) -> None:
         inst = self._instances.get(instance_id)
         if inst is None:
-            raise KeyError(f"Instance {instance_id} not found")
+            # Match DynamoDBStateStore: never recreate a deleted row.
+            logger.warning("Skipping update for missing instance %s", instance_id)
+            return
+        self._unindex(instance_id, inst)
         inst.update(fields)
+        self._index(instance_id, inst)
+
+    def update_instance_if_status(self, instance_id: str, expected_status: str, **fields) -> bool:
+        inst = self._instances.get(instance_id)
+        if inst is None or inst.get("status") != expected_status:
+            return False
+        self.update_instance(instance_id, **fields)
+        return True
 
     def remove_instance_fields(self, instance_id: str, *fields: str) -> None:
         inst = self._instances.get(instance_id)
         if inst is None:
-            raise KeyError(f"Instance {instance_id} not found")
+            logger.warning("Skipping update for missing instance %s", instance_id)
+            return
+        self._unindex(instance_id, inst)
         for field in fields:
             inst.pop(field, None)
+        self._index(instance_id, inst)
 
     def put_instance_if_absent(self, instance: dict) -> bool:
-        instance_id = instance["instance_id"]
-        if instance_id in self._instances:
+        existing = self._instances.get(instance["instance_id"])
+        if existing is not None and existing.get("status") != "terminated":
             return False
-        self._instances[instance_id] = instance
+        self.put_instance(instance)
         return True
 
     def delete_instance(self, instance_id: str) -> None:
-        self._instances.pop(instance_id, None)
+        inst = self._instances.pop(instance_id, None)
+        if inst is not None:
+            self._unindex(instance_id, inst)
+
+    def _index(self, instance_id: str, inst: dict) -> None:
+        if "model" in inst:
+            self._by_model.setdefault(inst["model"], {})[instance_id] = None
+        if "status" in inst:
+            self._by_status.setdefault(inst["status"], {})[instance_id] = None
+
+    def _unindex(self, instance_id: str, inst: dict) -> None:
+        if "model" in inst:
+            self._by_model.get(inst["model"], {}).pop(instance_id, None)
+        if "status" in inst:
+            self._by_status.get(inst["status"], {}).pop(instance_id, None)
 
     # --- Models ---
 
     def get_model_config(self, model_name: str) -> dict | None:
         return self._models.get(model_name)
 
-    def list_model_configs(self) -> list[dict]:
-        return list(self._models.values())
+    def list_model_configs(
+        self, *, fields: Sequence[str] | None = None, cached: bool = True
+    ) -> list[dict]:
+        return _project(list(self._models.values()), fields)
 
     def put_model_config(self, config: dict) -> None:
         self._models[config["name"]] = config
@@ -73,4 +130,19 @@ class InMemoryStateStore:
         self._api_keys.pop(key_hash, None)
 
     def list_api_keys(self, email: str) -> list[dict]:
-        return [k for k in self._api_keys.values() if k.get("email") == email]
+        keys = [k for k in self._api_keys.values() if k.get("email") == email]
+        return sorted(keys, key=lambda k: k.get("created_at", 0), reverse=True)
+
+
+def _requested_before(records: list[dict], cutoff: int | None) -> list[dict]:
+    """Mimic the DynamoDB last_request_at FilterExpression."""
+    if cutoff is None:
+        return records
+    return [r for r in records if "last_request_at" not in r or r["last_request_at"] < cutoff]
+
+
+def _project(records: list[dict], fields: Sequence[str] | None) -> list[dict]:
+    """Mimic a DynamoDB ProjectionExpression; unprojected reads return the live dicts."""
+    if fields is None:
+        return records
+    return [{f: r[f] for f in fields if f in r} for r in records]
@@ -4,22 +4,49 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import time
+from collections import OrderedDict
 
 from control_plane.core.interfaces import StateStore
 
+AUTH_CACHE_MAX_ENTRIES = 1024
+
+# Bound once: the authorizer hashes every incoming token.
+_sha256 = hashlib.sha256
+
+# key_hash -> (expires_at, email). Only successful lookups are cached, so a
+# newly created key is usable immediately; a deleted key stays valid until
+# its entry expires.
+_validated_keys: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
 
 def hash_api_key(token: str) -> str:
     """Return SHA-256 hash for a raw API token."""
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return _sha256(token.encode("utf-8")).hexdigest()
 
 
-def validate_api_key(token: str, state: StateStore) -> tuple[bool, str]:
+def validate_api_key(
+    token: str, state: StateStore, *, cache_ttl_seconds: float = 0
+) -> tuple[bool, str]:
     """Validate a raw API token against the state store.
 
+    With ``cache_ttl_seconds`` > 0, successful validations are remembered
+    in-process for that long and skip the state store lookup.
+
     Returns:
         (is_valid, email)
     """
     key_hash = hash_api_key(token)
+    now = time.monotonic()
+    if cache_ttl_seconds > 0:
+        cached = _validated_keys.get(key_hash)
+        if cached is not None:
+            expires_at, email = cached
+            if now < expires_at:
+                _validated_keys.move_to_end(key_hash)
+                return True, email
+            del _validated_keys[key_hash]
+
     record = state.get_api_key(key_hash)
     if not record:
         return False, ""
@@ -28,4 +55,9 @@ def validate_api_key(token: str, state: StateStore) -> tuple[bool, str]:
     if not hmac.compare_digest(expected_hash, key_hash):
         return False, ""
 
-    return True, record.get("email", "")
+    email = record.get("email", "")
+    if cache_ttl_seconds > 0:
+        _validated_keys[key_hash] = (now + cache_ttl_seconds, email)
+        if len(_validated_keys) > AUTH_CACHE_MAX_ENTRIES:
+            _validated_keys.popitem(last=False)
+    return True, email
@@ -2,27 +2,74 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 from control_plane.core.interfaces import StateStore
 
+READY_STATUSES = frozenset({"ready", "busy"})
+STARTING_STATUSES = frozenset({"starting", "draining", "stopping"})
+WARM_STATUSES = frozenset({"stopped"})
+
+# Overlaps get_cluster_state's two reads. Module-level so a warm Lambda keeps
+# its threads instead of starting and joining them on every request.
+_READ_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cluster-read")
+
+# Attributes the cluster view reads or returns. The instance projection is the
+# /api/cluster "instances" contract: every attribute the orchestrator and router
+# write to an instance row. Add new row attributes here to expose them.
+CLUSTER_MODEL_FIELDS = ("name", "instance_type", "idle_timeout")
+CLUSTER_INSTANCE_FIELDS = (
+    "instance_id",
+    "provider_instance_id",
+    "model",
+    "status",
+    "ip",
+    "previous_ip",
+    "instance_type",
+    "launch_config_hash",
+    "launched_at",
+    "started_at",
+    "last_request_at",
+    "active_request_starts",
+    "stopping_at",
+    "stopped_at",
+    "stop_error_at",
+    "warm_expires_at",
+)
+
 
 def get_cluster_state(state: StateStore) -> dict:
     """Return summarized cluster state for all configured models."""
-    models = state.list_model_configs()
-    instances = state.list_instances()
+    # The two reads are independent network round-trips; overlap them. The
+    # store is safe to share across threads (see DynamoDBStateStore).
+    models_future = _READ_POOL.submit(state.list_model_configs, fields=CLUSTER_MODEL_FIELDS)
+    instances_future = _READ_POOL.submit(state.list_instances, fields=CLUSTER_INSTANCE_FIELDS)
+    models = models_future.result()
+    instances = instances_future.result()
+
+    live_instances = [inst for inst in instances if inst.get("status") != "terminated"]
+    total_by_model: Counter[str] = Counter()
+    ready_by_model: Counter[str] = Counter()
+    starting_by_model: Counter[str] = Counter()
+    warm_by_model: Counter[str] = Counter()
+    for inst in live_instances:
+        inst_model = inst.get("model")
+        inst_status = inst.get("status")
+        total_by_model[inst_model] += 1
+        if inst_status in READY_STATUSES:
+            ready_by_model[inst_model] += 1
+        elif inst_status in STARTING_STATUSES:
+            starting_by_model[inst_model] += 1
+        elif inst_status in WARM_STATUSES:
+            warm_by_model[inst_model] += 1
 
     model_states = []
     for model in models:
         name = model["name"]
-        model_instances = [
-            inst
-            for inst in instances
-            if inst.get("model") == name and inst.get("status") != "terminated"
-        ]
-        ready_count = sum(1 for inst in model_instances if inst.get("status") in {"ready", "busy"})
-        starting_count = sum(
-            1 for inst in model_instances if inst.get("status") in {"starting", "draining", "stopping"}
-        )
-        warm_count = sum(1 for inst in model_instances if inst.get("status") == "stopped")
+        ready_count = ready_by_model[name]
+        starting_count = starting_by_model[name]
+        warm_count = warm_by_model[name]
 
         if ready_count > 0:
             status = "ready"
@@ -42,13 +89,13 @@ def get_cluster_state(state: StateStore) -> dict:
                 "ready_count": ready_count,
                 "starting_count": starting_count,
                 "warm_count": warm_count,
-                "instance_count": len(model_instances),
+                "instance_count": total_by_model[name],
             }
         )
 
     return {
         "models": model_states,
-        "instances": [inst for inst in instances if inst.get("status") != "terminated"],
+        "instances": live_instances,
     }
 
 
@@ -58,7 +105,11 @@ def manual_scale(
     state: StateStore,
     trigger_scale_up,
 ) -> dict:
-    """Manually request a scale action for a model."""
+    """Manually request a scale action for a model.
+
+    ``trigger_scale_up`` may return False to report that the request was
+    coalesced into one already in flight.
+    """
     if not model:
         raise ValueError("model is required")
 
@@ -69,12 +120,19 @@ def manual_scale(
     normalized_action = action.lower().strip()
 
     if normalized_action == "up":
-        trigger_scale_up(model)
+        if state.list_instances(model=model, status="starting"):
+            return {
+                "ok": True,
+                "model": model,
+                "action": "up",
+                "message": "scale-up already in progress",
+            }
+        invoked = trigger_scale_up(model) is not False
         return {
             "ok": True,
             "model": model,
             "action": "up",
-            "message": "scale-up requested",
+            "message": "scale-up requested" if invoked else "scale-up already requested",
         }
 
     if normalized_action == "down":
@@ -7,6 +7,7 @@ wire them up in a thin handler layer.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Protocol
 
 
@@ -20,9 +21,19 @@ class StateStore(Protocol):
         ...
 
     def list_instances(
-        self, *, model: str | None = None, status: str | None = None
+        self,
+        *,
+        model: str | None = None,
+        status: str | None = None,
+        fields: Sequence[str] | None = None,
+        last_request_before: int | None = None,
     ) -> list[dict]:
-        """List instances, optionally filtered by model and/or status."""
+        """List instances, optionally filtered by model and/or status.
+
+        When ``fields`` is given, records contain only those attributes.
+        When ``last_request_before`` is given, only records whose
+        ``last_request_at`` is missing or earlier than it are returned.
+        """
         ...
 
     def put_instance(self, instance: dict) -> None:
@@ -33,12 +44,23 @@ class StateStore(Protocol):
         """Update specific fields on an instance record."""
         ...
 
+    def update_instance_if_status(self, instance_id: str, expected_status: str, **fields) -> bool:
+        """Update fields only if the record's status is still ``expected_status``.
+
+        Returns whether the update was applied.
+        """
+        ...
+
     def remove_instance_fields(self, instance_id: str, *fields: str) -> None:
         """Remove fields from an instance record."""
         ...
 
     def put_instance_if_absent(self, instance: dict) -> bool:
-        """Create an instance record if its primary key does not already exist."""
+        """Create an instance record unless a non-terminated one has its primary key.
+
+        A terminated record with the same key is overwritten. Returns whether
+        the record was written.
+        """
         ...
 
     def delete_instance(self, instance_id: str) -> None:
@@ -51,8 +73,18 @@ class StateStore(Protocol):
         """Get configuration for a model by name."""
         ...
 
-    def list_model_configs(self) -> list[dict]:
-        """List all configured models."""
+    def list_model_configs(
+        self, *, fields: Sequence[str] | None = None, cached: bool = True
+    ) -> list[dict]:
+        """List all configured models, optionally limited to ``fields``.
+
+        Backends may serve this from a short-lived cache; pass ``cached=False``
+        when the result drives scaling decisions and must be current.
+        """
+        ...
+
+    def put_model_config(self, config: dict) -> None:
+        """Create or overwrite a model's configuration."""
         ...
 
     # --- API Keys ---
@@ -70,7 +102,7 @@ class StateStore(Protocol):
         ...
 
     def list_api_keys(self, email: str) -> list[dict]:
-        """List all API keys belonging to an email."""
+        """List all API keys belonging to an email, newest first."""
         ...
 
 
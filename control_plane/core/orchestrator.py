@@ -9,13 +9,26 @@ import logging
 import hashlib
 import json
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from control_plane.core.interfaces import ComputeBackend, StateStore
 
 logger = logging.getLogger(__name__)
 
+# Reused across invocations of a warm Lambda so health probes keep their
+# connections to instances alive.
+_HEALTH_SESSION = requests.Session()
+_HEALTH_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+# (connect, read): an instance that is still booting usually refuses or drops
+# the SYN, so fail the connect quickly. The connect phase doubles as the TCP
+# reachability probe; a same-region handshake takes a few milliseconds, and a
+# probe that misses is retried on the next check_health pass.
+HEALTH_TIMEOUT = (0.5, 3)
+
 SERVER_PORT = 8000
 
 # Maximum time (seconds) to wait for an instance to become healthy before terminating.
@@ -24,13 +37,35 @@ DEFAULT_IDLE_TIMEOUT_SECONDS = 300
 DEFAULT_WARM_TIMEOUT_SECONDS = 8 * 60 * 60  # 8 hours
 DEFAULT_MAX_REQUEST_SECONDS = 20 * 60
 STOPPING_RECOVERY_SECONDS = 5 * 60
+# Bound on concurrent per-instance EC2 calls in one scale_down sweep. Worker
+# threads share the state store; see DynamoDBStateStore for why that is safe.
+SCALE_DOWN_WORKERS = 8
+
+# Overlaps scale_up's two initial reads; kept for the life of a warm Lambda.
+_READ_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scale-up-read")
+
+# Statuses that mean a model already has (or will shortly have) a serving instance,
+# in the order scale_up prefers to return them.
+ACTIVE_STATUSES = ("starting", "ready", "busy")
+
+
+class ScaleDownError(RuntimeError):
+    """Raised at the end of a scale_down sweep in which some instances failed.
+
+    ``results`` holds the transitions that did complete; ``failures`` maps
+    each failed instance_id to its exception.
+    """
+
+    def __init__(self, results: dict[str, list[str]], failures: dict[str, Exception]):
+        super().__init__(f"scale_down failed for {', '.join(failures)}")
+        self.results = results
+        self.failures = failures
 
 
 def scale_up(
     model_name: str,
     state: StateStore,
     compute: ComputeBackend,
-    vllm_api_key: str = "",
 ) -> dict:
     """Launch a GPU instance for the given model (idempotent).
 
@@ -39,26 +74,41 @@ def scale_up(
 
     Returns the instance record.
     """
+    # One query for all of the model's rows, overlapped with the config read;
+    # the per-status branches below work from this snapshot.
+    instances_future = _READ_POOL.submit(state.list_instances, model=model_name)
+    config_future = _READ_POOL.submit(state.get_model_config, model_name)
+    by_status = _group_by_status(instances_future.result())
+    model_config = config_future.result()
+
     # Idempotency: skip if already starting or ready
-    existing = state.list_instances(model=model_name, status="starting")
-    existing += state.list_instances(model=model_name, status="ready")
-    existing += state.list_instances(model=model_name, status="busy")
-    if existing:
-        logger.info("Instance already exists for %s: %s", model_name, existing[0]["instance_id"])
-        return existing[0]
-
-    model_config = state.get_model_config(model_name)
+    for status in ACTIVE_STATUSES:
+        if by_status[status]:
+            existing = by_status[status][0]
+            logger.info("Instance already exists for %s: %s", model_name, existing["instance_id"])
+            return existing
+
     if model_config is None:
         raise ValueError(f"Unknown model: {model_name}")
 
     now = int(time.time())
     launch_config_hash = _launch_config_hash(model_config, compute)
 
-    stopping = _reconcile_stopping_for_scale_up(model_name, state, compute, now)
-    if stopping is not None:
-        return stopping
+    if by_status["stopping"]:
+        stopping = _reconcile_stopping_instance(
+            by_status["stopping"][0],
+            state,
+            compute,
+            now,
+            touch_request=True,
+            recover_stale=False,
+        )
+        if stopping is not None:
+            return stopping
+        # Reconciling moved the row to stopped or terminated; re-read it.
+        by_status = _group_by_status(state.list_instances(model=model_name))
 
-    stopped = state.list_instances(model=model_name, status="stopped")
+    stopped = by_status["stopped"]
     if stopped:
         warm = stopped[0]
         if _warm_instance_expired(warm, now) or _launch_config_changed(
@@ -68,10 +118,12 @@ def scale_up(
             if provider_id:
                 compute.terminate(provider_id)
             state.update_instance(warm["instance_id"], status="terminated")
+            by_status["terminated"].append(warm)
         else:
             provider_id = warm.get("provider_instance_id")
             if not provider_id:
                 state.update_instance(warm["instance_id"], status="terminated")
+                by_status["terminated"].append(warm)
             else:
                 logger.info("Starting warm instance %s for model %s", provider_id, model_name)
                 state.update_instance(
@@ -102,12 +154,14 @@ def scale_up(
                 )
                 return warm
 
-    # Clean up any stale terminated record so put_instance_if_absent can succeed.
-    stale = state.list_instances(model=model_name, status="terminated")
-    for inst in stale:
-        state.delete_instance(inst["instance_id"])
-
     placeholder_id = f"model#{model_name}"
+
+    # The claim below overwrites a terminated placeholder; only rows under
+    # other IDs need deleting.
+    for inst in by_status["terminated"]:
+        if inst["instance_id"] != placeholder_id:
+            state.delete_instance(inst["instance_id"])
+
     placeholder = {
         "instance_id": placeholder_id,
         "model": model_name,
@@ -122,11 +176,10 @@ def scale_up(
     # Optimistic claim for scale-up ownership via conditional write.
     claimed = state.put_instance_if_absent(placeholder)
     if not claimed:
-        existing = state.list_instances(model=model_name, status="starting")
-        existing += state.list_instances(model=model_name, status="ready")
-        existing += state.list_instances(model=model_name, status="busy")
-        if existing:
-            return existing[0]
+        # The claim only fails if the placeholder row exists; read it by key.
+        winner = state.get_instance(placeholder_id)
+        if winner and winner.get("status") in ACTIVE_STATUSES:
+            return winner
         return placeholder
 
     # Launch instance after successful claim.
@@ -155,36 +208,53 @@ def scale_up(
     return placeholder
 
 
-def _reconcile_stopping_for_scale_up(
-    model_name: str,
-    state: StateStore,
-    compute: ComputeBackend,
-    now: int,
-) -> dict | None:
-    stopping = state.list_instances(model=model_name, status="stopping")
-    if not stopping:
-        return None
-
-    return _reconcile_stopping_instance(
-        stopping[0],
-        state,
-        compute,
-        now,
-        touch_request=True,
-        recover_stale=False,
-    )
+def _group_by_status(instances: list[dict]) -> defaultdict[str, list[dict]]:
+    by_status: defaultdict[str, list[dict]] = defaultdict(list)
+    for inst in instances:
+        by_status[inst.get("status", "")].append(inst)
+    return by_status
 
 
 def scale_down(state: StateStore, compute: ComputeBackend) -> dict[str, list[str]]:
-    """Move idle instances to warm state, then terminate expired warm instances."""
+    """Move idle instances to warm state, then terminate expired warm instances.
+
+    Every instance is attempted even if some fail; failures are logged and
+    raised together as a ScaleDownError once the sweep finishes.
+    """
     results: dict[str, list[str]] = {"stopping": [], "stopped": [], "terminated": []}
     now = int(time.time())
+    # instance_id -> exception; one failing instance must not hide the others.
+    failures: dict[str, Exception] = {}
 
     _recover_stopping_instances(state, compute, now)
 
-    ready_instances = state.list_instances(status="ready")
+    # Several instances usually share a model; fetch each config once per sweep.
+    # Timeouts decide what gets stopped, so skip the store's TTL cache.
+    model_configs: dict[str, dict | None] = {
+        config["name"]: config for config in state.list_model_configs(cached=False)
+    }
+
+    def model_config_for(model_name: str) -> dict | None:
+        if model_name not in model_configs:
+            model_configs[model_name] = state.get_model_config(model_name)
+        return model_configs[model_name]
+
+    # Only rows idle past the shortest timeout can qualify; the per-model
+    # timeout is still checked below.
+    min_idle_timeout = min(
+        [DEFAULT_IDLE_TIMEOUT_SECONDS]
+        + [
+            int(config.get("idle_timeout", DEFAULT_IDLE_TIMEOUT_SECONDS))
+            for config in model_configs.values()
+            if config
+        ]
+    )
+    ready_instances = state.list_instances(
+        status="ready", last_request_before=now - min_idle_timeout
+    )
+    idle: list[tuple[dict, int, int]] = []
     for inst in ready_instances:
-        model_config = state.get_model_config(inst["model"])
+        model_config = model_config_for(inst["model"])
         idle_timeout = DEFAULT_IDLE_TIMEOUT_SECONDS
         warm_timeout = DEFAULT_WARM_TIMEOUT_SECONDS
         if model_config:
@@ -193,75 +263,30 @@ def scale_down(state: StateStore, compute: ComputeBackend) -> dict[str, list[str
 
         last_request = int(inst.get("last_request_at", inst.get("launched_at", 0)))
         if now - last_request > idle_timeout:
-            provider_id = inst.get("provider_instance_id", inst["instance_id"])
-            provider_status = {}
+            idle.append((inst, warm_timeout, last_request))
+
+    # Each idle instance is independent and mostly waits on EC2; handle them
+    # concurrently. Results are collected in submission order.
+    with ThreadPoolExecutor(max_workers=SCALE_DOWN_WORKERS) as pool:
+        futures = [
+            pool.submit(
+                _scale_down_idle_instance, inst, state, compute, now, warm_timeout, last_request
+            )
+            for inst, warm_timeout, last_request in idle
+        ]
+        for (inst, _, _), future in zip(idle, futures):
             try:
-                provider_status = compute.instance_status(provider_id)
-            except Exception:
-                logger.exception("Failed to inspect idle instance %s", provider_id)
-
-            provider_state = provider_status.get("state", "")
-            if provider_state == "stopped":
-                state.update_instance(
-                    inst["instance_id"],
-                    status="stopped",
-                    previous_ip=inst.get("ip", ""),
-                    ip="",
-                    stopped_at=now,
-                    warm_expires_at=now + warm_timeout,
-                )
-                results["stopped"].append(inst["instance_id"])
-                continue
-            if provider_state == "stopping":
-                state.update_instance(
-                    inst["instance_id"],
-                    status="stopping",
-                    stopping_at=now,
-                    warm_expires_at=now + warm_timeout,
-                )
-                results["stopping"].append(inst["instance_id"])
+                outcome = future.result()
+            except Exception as exc:
+                logger.exception("Failed to scale down idle instance %s", inst["instance_id"])
+                failures[inst["instance_id"]] = exc
                 continue
-
-            if warm_timeout > 0:
-                logger.info(
-                    "Stopping idle instance %s (model=%s, idle=%ds, warm_timeout=%ds)",
-                    inst["instance_id"],
-                    inst["model"],
-                    now - last_request,
-                    warm_timeout,
-                )
-                state.update_instance(
-                    inst["instance_id"],
-                    status="stopping",
-                    stopping_at=now,
-                    warm_expires_at=now + warm_timeout,
-                )
-                try:
-                    compute.stop(provider_id)
-                except Exception:
-                    logger.exception("Failed to stop idle instance %s", provider_id)
-                    state.update_instance(
-                        inst["instance_id"],
-                        status="ready",
-                        last_request_at=now,
-                        stop_error_at=now,
-                    )
-                    raise
-                results["stopping"].append(inst["instance_id"])
-            else:
-                logger.info(
-                    "Terminating idle instance %s (model=%s, idle=%ds)",
-                    inst["instance_id"],
-                    inst["model"],
-                    now - last_request,
-                )
-                state.update_instance(inst["instance_id"], status="draining")
-                compute.terminate(provider_id)
-                state.update_instance(inst["instance_id"], status="terminated")
-                results["terminated"].append(inst["instance_id"])
+            if outcome is not None:
+                bucket, instance_id = outcome
+                results[bucket].append(instance_id)
 
     for inst in state.list_instances(status="busy"):
-        model_config = state.get_model_config(inst["model"])
+        model_config = model_config_for(inst["model"])
         max_request_seconds = DEFAULT_MAX_REQUEST_SECONDS
         if model_config:
             max_request_seconds = int(
@@ -282,19 +307,118 @@ def scale_down(state: StateStore, compute: ComputeBackend) -> dict[str, list[str
             )
             state.remove_instance_fields(inst["instance_id"], "active_request_starts")
 
-    for inst in state.list_instances(status="stopped"):
-        if not _warm_instance_expired(inst, now):
-            continue
-        provider_id = inst.get("provider_instance_id")
-        logger.info("Terminating expired warm instance %s (model=%s)", inst["instance_id"], inst.get("model"))
-        if provider_id:
-            compute.terminate(provider_id)
-        state.update_instance(inst["instance_id"], status="terminated")
-        results["terminated"].append(inst["instance_id"])
+    expired = [
+        inst for inst in state.list_instances(status="stopped") if _warm_instance_expired(inst, now)
+    ]
+    with ThreadPoolExecutor(max_workers=SCALE_DOWN_WORKERS) as pool:
+        futures = [pool.submit(_terminate_warm_instance, inst, state, compute) for inst in expired]
+        for inst, future in zip(expired, futures):
+            try:
+                future.result()
+            except Exception as exc:
+                logger.exception("Failed to terminate warm instance %s", inst["instance_id"])
+                failures[inst["instance_id"]] = exc
+                continue
+            results["terminated"].append(inst["instance_id"])
 
+    if failures:
+        raise ScaleDownError(results, failures) from next(iter(failures.values()))
     return results
 
 
+def _terminate_warm_instance(inst: dict, state: StateStore, compute: ComputeBackend) -> None:
+    provider_id = inst.get("provider_instance_id")
+    logger.info("Terminating expired warm instance %s (model=%s)", inst["instance_id"], inst.get("model"))
+    if provider_id:
+        compute.terminate(provider_id)
+    state.update_instance(inst["instance_id"], status="terminated")
+
+
+def _scale_down_idle_instance(
+    inst: dict,
+    state: StateStore,
+    compute: ComputeBackend,
+    now: int,
+    warm_timeout: int,
+    last_request: int,
+) -> tuple[str, str] | None:
+    """Stop or terminate one idle ready instance; return (results key, instance_id)."""
+    provider_id = inst.get("provider_instance_id", inst["instance_id"])
+    provider_status = {}
+    try:
+        provider_status = compute.instance_status(provider_id)
+    except Exception:
+        logger.exception("Failed to inspect idle instance %s", provider_id)
+
+    provider_state = provider_status.get("state", "")
+    if provider_state == "stopped":
+        state.update_instance(
+            inst["instance_id"],
+            status="stopped",
+            previous_ip=inst.get("ip", ""),
+            ip="",
+            stopped_at=now,
+            warm_expires_at=now + warm_timeout,
+        )
+        return "stopped", inst["instance_id"]
+    if provider_state == "stopping":
+        state.update_instance(
+            inst["instance_id"],
+            status="stopping",
+            stopping_at=now,
+            warm_expires_at=now + warm_timeout,
+        )
+        return "stopping", inst["instance_id"]
+
+    # The router may have claimed the instance since it was listed;
+    # each transition below only applies while it is still ready.
+    if warm_timeout > 0:
+        if not state.update_instance_if_status(
+            inst["instance_id"],
+            "ready",
+            status="stopping",
+            stopping_at=now,
+            warm_expires_at=now + warm_timeout,
+        ):
+            logger.info("Instance %s is no longer ready; not stopping", inst["instance_id"])
+            return None
+        logger.info(
+            "Stopping idle instance %s (model=%s, idle=%ds, warm_timeout=%ds)",
+            inst["instance_id"],
+            inst["model"],
+            now - last_request,
+            warm_timeout,
+        )
+        try:
+            compute.stop(provider_id)
+        except Exception:
+            logger.exception("Failed to stop idle instance %s", provider_id)
+            state.update_instance(
+                inst["instance_id"],
+                status="ready",
+                last_request_at=now,
+                stop_error_at=now,
+            )
+            raise
+        return "stopping", inst["instance_id"]
+    else:
+        # draining takes the instance out of routing before EC2 is told.
+        if not state.update_instance_if_status(
+            inst["instance_id"], "ready", status="draining"
+        ):
+            logger.info("Instance %s is no longer ready; not terminating", inst["instance_id"])
+            return None
+        logger.info(
+            "Terminating idle instance %s (model=%s, idle=%ds)",
+            inst["instance_id"],
+            inst["model"],
+            now - last_request,
+        )
+        compute.terminate(provider_id)
+        state.update_instance(inst["instance_id"], status="terminated")
+        return "terminated", inst["instance_id"]
+
+
 def _recover_stopping_instances(state: StateStore, compute: ComputeBackend, now: int) -> None:
     for inst in state.list_instances(status="stopping"):
         _reconcile_stopping_instance(
@@ -476,6 +600,15 @@ def check_health(
             results["terminated"].append(instance_id)
             continue
 
+        if not ip and provider_id:
+            # Launch returns before EC2 assigns a public IP; pick it up here.
+            try:
+                ip = compute.instance_status(provider_id).get("ip", "")
+            except Exception:
+                logger.exception("Failed to inspect starting instance %s", provider_id)
+            if ip:
+                state.update_instance(instance_id, ip=ip)
+
         if not ip:
             results["still_starting"].append(instance_id)
             continue
@@ -484,7 +617,7 @@ def check_health(
         try:
             url = f"http://{ip}:{SERVER_PORT}/health"
             headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
-            resp = requests.get(url, headers=headers, timeout=5)
+            resp = _HEALTH_SESSION.get(url, headers=headers, timeout=HEALTH_TIMEOUT)
             if resp.status_code == 200:
                 state.update_instance(instance_id, status="ready", last_request_at=now)
                 logger.info("Instance %s (model=%s) is now ready", instance_id, inst.get("model"))
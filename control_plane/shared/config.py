@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
+
 
 def get_env(name: str, default: str | None = None) -> str:
     """Get an environment variable, raising if missing and no default."""
@@ -12,10 +14,42 @@ def get_env(name: str, default: str | None = None) -> str:
     return value
 
 
+# Lambda environment variables are fixed for the lifetime of the execution
+# environment, so each lookup is cached after the first call.
+
+
 # Table / resource names (set by SAM template)
-INSTANCES_TABLE = lambda: get_env("INSTANCES_TABLE")
-MODELS_TABLE = lambda: get_env("MODELS_TABLE")
-API_KEYS_TABLE = lambda: get_env("API_KEYS_TABLE")
-ORCHESTRATOR_FUNCTION_NAME = lambda: get_env("ORCHESTRATOR_FUNCTION_NAME")
-ALLOWED_EMAILS = lambda: get_env("ALLOWED_EMAILS", "")
-GOOGLE_CLIENT_ID = lambda: get_env("GOOGLE_CLIENT_ID", "")
+@lru_cache(maxsize=None)
+def INSTANCES_TABLE() -> str:
+    return get_env("INSTANCES_TABLE")
+
+
+@lru_cache(maxsize=None)
+def MODELS_TABLE() -> str:
+    return get_env("MODELS_TABLE")
+
+
+@lru_cache(maxsize=None)
+def API_KEYS_TABLE() -> str:
+    return get_env("API_KEYS_TABLE")
+
+
+@lru_cache(maxsize=None)
+def ORCHESTRATOR_FUNCTION_NAME() -> str:
+    return get_env("ORCHESTRATOR_FUNCTION_NAME")
+
+
+@lru_cache(maxsize=None)
+def ALLOWED_EMAILS() -> str:
+    return get_env("ALLOWED_EMAILS", "")
+
+
+@lru_cache(maxsize=None)
+def GOOGLE_CLIENT_ID() -> str:
+    return get_env("GOOGLE_CLIENT_ID", "")
+
+
+@lru_cache(maxsize=None)
+def AUTH_CACHE_TTL_SECONDS() -> float:
+    # Off by default: while cached, a deleted key keeps authorizing requests.
+    return float(get_env("AUTH_CACHE_TTL_SECONDS", "0"))
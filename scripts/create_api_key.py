@@ -13,6 +13,20 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from control_plane.core.keys import create_key
+
+
+def _state_store(env: str, region: str | None):
+    """Build the stack's state store; boto3 is only imported once args parse."""
+    from control_plane.backends.aws.state import DynamoDBStateStore
+
+    return DynamoDBStateStore(
+        instances_table=f"zerollm-instances-{env}",
+        models_table=f"zerollm-models-{env}",
+        api_keys_table=f"zerollm-api-keys-{env}",
+        region_name=region,
+    )
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Create a ZeroLLM API key")
@@ -30,17 +44,7 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    env = args.environment
-
-    from control_plane.backends.aws.state import DynamoDBStateStore
-    from control_plane.core.keys import create_key
-
-    state = DynamoDBStateStore(
-        instances_table=f"zerollm-instances-{env}",
-        models_table=f"zerollm-models-{env}",
-        api_keys_table=f"zerollm-api-keys-{env}",
-        region_name=args.region,
-    )
+    state = _state_store(args.environment, args.region)
     created = create_key(email=args.email, name=args.name, state=state)
     print(json.dumps(created, indent=2))
 
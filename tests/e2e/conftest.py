@@ -12,6 +12,8 @@ from botocore.exceptions import BotoCoreError
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
+from control_plane.backends.aws import handlers
+from control_plane.backends.mock.state import InMemoryStateStore
 from tests.e2e.mock_vllm import MockVLLMServer
 
 
@@ -24,6 +26,14 @@ def mock_vllm():
     server.stop()
 
 
+@pytest.fixture
+def mock_state(monkeypatch):
+    """In-memory state store installed as the handlers' state backend."""
+    state = InMemoryStateStore()
+    monkeypatch.setattr(handlers, "_get_state_store", lambda: state)
+    return state
+
+
 @pytest.fixture(scope="session")
 def localstack_env():
     """Start LocalStack and provision DynamoDB tables used by handlers."""
@@ -79,7 +89,12 @@ def localstack_env():
                     {"AttributeName": "status", "KeyType": "RANGE"},
                 ],
                 "Projection": {"ProjectionType": "ALL"},
-            }
+            },
+            {
+                "IndexName": "status-index",
+                "KeySchema": [{"AttributeName": "status", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
         ],
     )
 
@@ -95,6 +110,7 @@ def localstack_env():
         AttributeDefinitions=[
             {"AttributeName": "key_hash", "AttributeType": "S"},
             {"AttributeName": "email", "AttributeType": "S"},
+            {"AttributeName": "created_at", "AttributeType": "N"},
         ],
         KeySchema=[{"AttributeName": "key_hash", "KeyType": "HASH"}],
         BillingMode="PAY_PER_REQUEST",
@@ -103,7 +119,15 @@ def localstack_env():
                 "IndexName": "email-index",
                 "KeySchema": [{"AttributeName": "email", "KeyType": "HASH"}],
                 "Projection": {"ProjectionType": "ALL"},
-            }
+            },
+            {
+                "IndexName": "email-created-index",
+                "KeySchema": [
+                    {"AttributeName": "email", "KeyType": "HASH"},
+                    {"AttributeName": "created_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
         ],
     )
 
@@ -11,74 +11,89 @@ from __future__ import annotations
 
 import json
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _encode(body: dict) -> bytes:
+    return json.dumps(body).encode()
+
+
+# Canned responses never change; encode them once.
+_HEALTH_BODY = _encode({"status": "ok"})
+_MODELS_BODY = _encode(
+    {
+        "object": "list",
+        "data": [
+            {
+                "id": "Qwen/Qwen3-32B",
+                "object": "model",
+                "owned_by": "zerollm",
+            }
+        ],
+    }
+)
+_RESPONSES_BODY = _encode(
+    {
+        "id": "resp-mock",
+        "object": "response",
+        "output_text": "Hello! I'm a mock response.",
+    }
+)
+_CHAT_BODY = _encode(
+    {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": "Hello! I'm a mock vLLM response.",
+                },
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 10,
+            "completion_tokens": 8,
+            "total_tokens": 18,
+        },
+    }
+)
+_NOT_FOUND_BODY = _encode({"error": "not found"})
+
+_GET_BODIES = {"/health": _HEALTH_BODY, "/v1/models": _MODELS_BODY}
+_POST_BODIES = {"/v1/responses": _RESPONSES_BODY, "/v1/chat/completions": _CHAT_BODY}
 
 
 class MockVLLMHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled clients reuse one connection across requests.
+    protocol_version = "HTTP/1.1"
+
     def do_GET(self):
-        if self.path == "/health":
-            self._respond(200, {"status": "ok"})
-        elif self.path == "/v1/models":
-            self._respond(
-                200,
-                {
-                    "object": "list",
-                    "data": [
-                        {
-                            "id": "Qwen/Qwen3-32B",
-                            "object": "model",
-                            "owned_by": "zerollm",
-                        }
-                    ],
-                },
-            )
+        body = _GET_BODIES.get(self.path)
+        if body is None:
+            self._respond(404, _NOT_FOUND_BODY)
         else:
-            self._respond(404, {"error": "not found"})
+            self._respond(200, body)
 
     def do_POST(self):
         content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length else b"{}"
-
-        if self.path == "/v1/responses":
-            self._respond(
-                200,
-                {
-                    "id": "resp-mock",
-                    "object": "response",
-                    "output_text": "Hello! I'm a mock response.",
-                },
-            )
-        elif self.path == "/v1/chat/completions":
-            self._respond(
-                200,
-                {
-                    "id": "chatcmpl-mock",
-                    "object": "chat.completion",
-                    "choices": [
-                        {
-                            "index": 0,
-                            "message": {
-                                "role": "assistant",
-                                "content": "Hello! I'm a mock vLLM response.",
-                            },
-                            "finish_reason": "stop",
-                        }
-                    ],
-                    "usage": {
-                        "prompt_tokens": 10,
-                        "completion_tokens": 8,
-                        "total_tokens": 18,
-                    },
-                },
-            )
+        if content_length:
+            self.rfile.read(content_length)
+
+        body = _POST_BODIES.get(self.path)
+        if body is None:
+            self._respond(404, _NOT_FOUND_BODY)
         else:
-            self._respond(404, {"error": "not found"})
+            self._respond(200, body)
 
-    def _respond(self, status: int, body: dict):
+    def _respond(self, status: int, body: bytes):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+        self.wfile.write(body)
 
     def log_message(self, format, *args):
         pass  # Suppress request logs during tests
@@ -86,16 +101,22 @@ class MockVLLMHandler(BaseHTTPRequestHandler):
 
 class MockVLLMServer:
     def __init__(self, host: str = "127.0.0.1", port: int = 0):
-        self.server = HTTPServer((host, port), MockVLLMHandler)
+        # Threaded: a kept-alive connection must not block other clients.
+        self.server = ThreadingHTTPServer((host, port), MockVLLMHandler)
+        self.server.daemon_threads = True
         self.host = host
         self.port = self.server.server_address[1]  # actual port (0 = auto-assign)
         self._thread: threading.Thread | None = None
 
     def start(self):
-        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        # shutdown() waits for the serve loop's next poll; keep teardown short.
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
         self._thread.start()
 
     def stop(self):
         self.server.shutdown()
+        self.server.server_close()
         if self._thread:
             self._thread.join(timeout=5)
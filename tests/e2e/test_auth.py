@@ -5,22 +5,15 @@ from __future__ import annotations
 import json
 
 from control_plane.backends.aws import handlers
-from control_plane.backends.mock.state import InMemoryStateStore
 
 
-def test_requests_rejected_without_key(monkeypatch):
-    state = InMemoryStateStore()
-    monkeypatch.setattr(handlers, "_get_state_store", lambda: state)
-
+def test_requests_rejected_without_key(mock_state):
     result = handlers.authorizer_handler({"headers": {}}, None)
 
     assert result == {"isAuthorized": False}
 
 
-def test_key_creation_then_authorizer_accepts_key(monkeypatch):
-    state = InMemoryStateStore()
-    monkeypatch.setattr(handlers, "_get_state_store", lambda: state)
-
+def test_key_creation_then_authorizer_accepts_key(mock_state):
     create_event = {
         "requestContext": {"http": {"method": "POST"}, "authorizer": {"lambda": {"email": "owner@example.com"}}},
         "rawPath": "/api/keys",
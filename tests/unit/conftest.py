@@ -21,8 +21,10 @@ SAMPLE_MODEL_CONFIG = {
 
 @pytest.fixture
 def state():
+    # Building a store is far cheaper than deep-copying a shared template; give
+    # each test its own config dict so mutations cannot leak between tests.
     store = InMemoryStateStore()
-    store.put_model_config(SAMPLE_MODEL_CONFIG)
+    store.put_model_config(dict(SAMPLE_MODEL_CONFIG))
     return store
 
 
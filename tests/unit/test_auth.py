@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+
+from control_plane.core import auth
 from control_plane.core.auth import hash_api_key, validate_api_key
+from control_plane.core.keys import create_key, delete_key
 
 
 def test_validate_api_key_returns_true_for_stored_key(state):
@@ -27,3 +31,42 @@ def test_validate_api_key_returns_false_for_unknown_key(state):
 
     assert valid is False
     assert email == ""
+
+
+def test_validate_api_key_cache_skips_store_until_ttl_expires(monkeypatch, state):
+    now = 100.0
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now)
+    monkeypatch.setattr(auth, "_validated_keys", OrderedDict())
+    token = "zllm-cached-token"
+    state.put_api_key({"key_hash": hash_api_key(token), "email": "c@example.com"})
+
+    assert validate_api_key(token, state, cache_ttl_seconds=30) == (True, "c@example.com")
+    state.delete_api_key(hash_api_key(token))
+    assert validate_api_key(token, state, cache_ttl_seconds=30) == (True, "c@example.com")
+
+    now += 30
+    assert validate_api_key(token, state, cache_ttl_seconds=30) == (False, "")
+
+
+def test_deleted_key_is_rejected_once_its_cache_entry_expires(monkeypatch, state):
+    now = 100.0
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now)
+    monkeypatch.setattr(auth, "_validated_keys", OrderedDict())
+    created = create_key("owner@example.com", "laptop", state)
+
+    assert validate_api_key(created["key"], state, cache_ttl_seconds=10)[0] is True
+    delete_key(created["key_id"], "owner@example.com", state)
+
+    now += 9
+    assert validate_api_key(created["key"], state, cache_ttl_seconds=10)[0] is True
+    now += 1
+    assert validate_api_key(created["key"], state, cache_ttl_seconds=10) == (False, "")
+
+
+def test_deleted_key_is_rejected_immediately_without_cache(state):
+    created = create_key("owner@example.com", "laptop", state)
+    assert validate_api_key(created["key"], state)[0] is True
+
+    delete_key(created["key_id"], "owner@example.com", state)
+
+    assert validate_api_key(created["key"], state) == (False, "")
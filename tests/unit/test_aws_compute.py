@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from botocore.exceptions import ClientError
+
 from control_plane.backends.aws.compute import EC2ComputeBackend
 
 
@@ -44,3 +46,60 @@ def test_build_user_data_validates_prebaked_model_when_s3_key_absent():
     assert "aws s3 cp" not in user_data
     assert "log_step 'model_prebaked_expected path=/opt/models/small.gguf'" in user_data
     assert "test -s /opt/models/small.gguf" in user_data
+
+
+class FakeEC2:
+    def __init__(self, capacity_errors: int = 0):
+        self.capacity_errors = capacity_errors
+        self.run_calls: list[dict] = []
+
+    def run_instances(self, **kwargs):
+        self.run_calls.append(kwargs)
+        if len(self.run_calls) <= self.capacity_errors:
+            raise ClientError(
+                {"Error": {"Code": "InsufficientInstanceCapacity"}}, "RunInstances"
+            )
+        return {"Instances": [{"InstanceId": "i-new"}]}
+
+    def get_waiter(self, name):
+        self.waited_for = name
+        return self
+
+    def wait(self, **kwargs):
+        self.wait_kwargs = kwargs
+
+    def describe_instances(self, InstanceIds):
+        return {"Reservations": [{"Instances": [{"PublicIpAddress": "203.0.113.7"}]}]}
+
+
+def test_launch_sends_a_fresh_client_token_per_subnet_attempt():
+    ec2 = FakeEC2(capacity_errors=1)
+    backend = EC2ComputeBackend(
+        ami_id="ami-1",
+        security_group_id="sg-1",
+        subnet_id="subnet-a,subnet-b",
+        instance_profile_arn="arn:profile",
+        ec2_client=ec2,
+    )
+
+    instance_id, _ = backend.launch({"name": "m", "instance_type": "g5.xlarge"})
+
+    assert instance_id == "i-new"
+    tokens = [call["ClientToken"] for call in ec2.run_calls]
+    assert len(tokens) == 2
+    assert all(tokens) and tokens[0] != tokens[1]
+
+
+def test_launch_waits_for_running_and_returns_public_ip():
+    ec2 = FakeEC2()
+    backend = EC2ComputeBackend(
+        ami_id="ami-1",
+        security_group_id="sg-1",
+        subnet_id="subnet-a",
+        instance_profile_arn="arn:profile",
+        ec2_client=ec2,
+    )
+
+    assert backend.launch({"name": "m", "instance_type": "g5.xlarge"}) == ("i-new", "203.0.113.7")
+    assert ec2.waited_for == "instance_running"
+    assert ec2.wait_kwargs["InstanceIds"] == ["i-new"]
@@ -0,0 +1,195 @@
+"""Unit tests for the DynamoDB state store query paths."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from control_plane.backends.aws import state as aws_state
+from control_plane.backends.aws.state import DynamoDBStateStore
+
+
+class FakeTable:
+    def __init__(self, pages: list[list[dict]]):
+        self.pages = pages
+        self.calls: list[dict] = []
+
+    def _page(self, kwargs):
+        self.calls.append(kwargs)
+        index = len(self.calls) - 1
+        resp = {"Items": list(self.pages[index])}
+        if index + 1 < len(self.pages):
+            resp["LastEvaluatedKey"] = {"page": index + 1}
+        return resp
+
+    def query(self, **kwargs):
+        return self._page(kwargs)
+
+    def scan(self, **kwargs):
+        return self._page(kwargs)
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+
+    def put_item(self, **kwargs):
+        pass
+
+
+class ConditionalCheckFailed(Exception):
+    pass
+
+
+class MissingRowTable(FakeTable):
+    """A table whose conditional updates always fail, as for a deleted row."""
+
+    meta = SimpleNamespace(
+        client=SimpleNamespace(
+            exceptions=SimpleNamespace(ConditionalCheckFailedException=ConditionalCheckFailed)
+        )
+    )
+
+    def update_item(self, **kwargs):
+        self.calls.append(kwargs)
+        raise ConditionalCheckFailed
+
+
+def _store(instances=None, models=None) -> DynamoDBStateStore:
+    store = DynamoDBStateStore.__new__(DynamoDBStateStore)
+    store._instances = instances or FakeTable([[]])
+    store._models = models or FakeTable([[]])
+    store._api_keys = FakeTable([[]])
+    store._model_configs_cache = {}
+    return store
+
+
+def test_list_instances_by_status_queries_status_index_across_pages():
+    table = FakeTable([[{"instance_id": "a"}], [{"instance_id": "b"}]])
+
+    items = _store(instances=table).list_instances(status="starting")
+
+    assert [item["instance_id"] for item in items] == ["a", "b"]
+    assert all(call["IndexName"] == "status-index" for call in table.calls)
+    assert table.calls[1]["ExclusiveStartKey"] == {"page": 1}
+
+
+def test_list_model_configs_is_cached_until_ttl_expires(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(aws_state.time, "monotonic", lambda: now)
+    table = FakeTable([[{"name": "m"}]])
+    store = _store(models=table)
+
+    assert store.list_model_configs() == [{"name": "m"}]
+    assert store.list_model_configs() == [{"name": "m"}]
+    assert len(table.calls) == 1
+
+    now += aws_state.MODEL_CONFIGS_TTL_SECONDS
+    table.pages = [[{"name": "m"}, {"name": "n"}]]
+    table.calls = []
+
+    assert store.list_model_configs() == [{"name": "m"}, {"name": "n"}]
+
+
+def test_list_model_configs_uncached_always_scans():
+    table = FakeTable([[{"name": "m"}]])
+    store = _store(models=table)
+    store.list_model_configs()
+
+    table.pages = [[{"name": "m"}, {"name": "n"}]]
+    table.calls = []
+
+    assert store.list_model_configs(cached=False) == [{"name": "m"}, {"name": "n"}]
+    assert len(table.calls) == 1
+
+
+def test_put_model_config_invalidates_cached_configs():
+    table = FakeTable([[{"name": "m"}]])
+    store = _store(models=table)
+    store.list_model_configs()
+
+    table.pages = [[{"name": "m"}, {"name": "n"}]]
+    table.calls = []
+    store.put_model_config({"name": "n"})
+
+    assert store.list_model_configs() == [{"name": "m"}, {"name": "n"}]
+
+
+def test_update_instance_builds_set_expression_for_one_and_many_fields():
+    table = FakeTable([[]])
+    store = _store(instances=table)
+
+    store.update_instance("i-1", status="ready")
+    store.update_instance("i-1", status="stopped", ip="")
+
+    assert table.calls[0]["UpdateExpression"] == "SET #n0 = :v0"
+    assert table.calls[0]["ConditionExpression"] == "attribute_exists(instance_id)"
+    assert table.calls[0]["ExpressionAttributeNames"] == {"#n0": "status"}
+    assert table.calls[1]["UpdateExpression"] == "SET #n0 = :v0, #n1 = :v1"
+    assert table.calls[1]["ExpressionAttributeValues"] == {":v0": "stopped", ":v1": ""}
+
+
+def test_list_instances_projects_requested_fields_with_aliases():
+    table = FakeTable([[{"instance_id": "a", "status": "ready"}]])
+
+    _store(instances=table).list_instances(fields=("instance_id", "status"))
+
+    assert table.calls[0]["ProjectionExpression"] == "#p0, #p1"
+    assert table.calls[0]["ExpressionAttributeNames"] == {"#p0": "instance_id", "#p1": "status"}
+
+
+def test_list_instances_filters_on_last_request_server_side():
+    table = FakeTable([[]])
+
+    _store(instances=table).list_instances(status="ready", last_request_before=100)
+
+    assert table.calls[0]["IndexName"] == "status-index"
+    assert table.calls[0]["KeyConditionExpression"] == "#status = :status"
+    assert table.calls[0]["FilterExpression"] == (
+        "attribute_not_exists(#last_request_at) OR #last_request_at < :last_request_before"
+    )
+    assert table.calls[0]["ExpressionAttributeValues"] == {
+        ":last_request_before": 100,
+        ":status": "ready",
+    }
+
+
+def test_list_instances_by_model_and_status_writes_string_key_condition():
+    table = FakeTable([[]])
+
+    _store(instances=table).list_instances(model="m", status="ready", fields=("instance_id",))
+
+    assert table.calls[0]["IndexName"] == "model-status-index"
+    assert table.calls[0]["KeyConditionExpression"] == "#model = :model AND #status = :status"
+    assert table.calls[0]["ExpressionAttributeNames"] == {
+        "#p0": "instance_id",
+        "#model": "model",
+        "#status": "status",
+    }
+
+
+def test_updates_to_missing_instance_are_skipped():
+    table = MissingRowTable([[]])
+    store = _store(instances=table)
+
+    store.update_instance("gone", status="ready")
+    store.remove_instance_fields("gone", "ip")
+
+    assert [call["ConditionExpression"] for call in table.calls] == [
+        "attribute_exists(instance_id)",
+        "attribute_exists(instance_id)",
+    ]
+
+
+def test_update_instance_if_status_conditions_on_expected_status():
+    table = FakeTable([[]])
+
+    applied = _store(instances=table).update_instance_if_status("i-1", "ready", status="draining")
+
+    assert applied is True
+    assert table.calls[0]["ConditionExpression"] == "#expected_status = :expected_status"
+    assert table.calls[0]["ExpressionAttributeNames"] == {
+        "#n0": "status",
+        "#expected_status": "status",
+    }
+    assert table.calls[0]["ExpressionAttributeValues"] == {
+        ":v0": "draining",
+        ":expected_status": "ready",
+    }
@@ -36,6 +36,65 @@ def test_get_cluster_state_reports_cold_and_ready_models(state):
     assert by_name["Meta/Llama-3"]["status"] == "cold"
 
 
+def test_get_cluster_state_counts_warming_and_warm_instances(state):
+    state.put_model_config({"name": "Meta/Llama-3", "instance_type": "g5.xlarge"})
+    for instance_id, model, status in [
+        ("model#Qwen/Qwen3-32B", "Qwen/Qwen3-32B", "starting"),
+        ("old-qwen", "Qwen/Qwen3-32B", "terminated"),
+        ("model#Meta/Llama-3", "Meta/Llama-3", "stopped"),
+    ]:
+        state.put_instance({"instance_id": instance_id, "model": model, "status": status})
+
+    result = get_cluster_state(state)
+
+    by_name = {model["name"]: model for model in result["models"]}
+    assert by_name["Qwen/Qwen3-32B"]["status"] == "warming"
+    assert by_name["Qwen/Qwen3-32B"]["starting_count"] == 1
+    assert by_name["Qwen/Qwen3-32B"]["instance_count"] == 1
+    assert by_name["Meta/Llama-3"]["status"] == "warm"
+    assert by_name["Meta/Llama-3"]["warm_count"] == 1
+    assert {inst["instance_id"] for inst in result["instances"]} == {
+        "model#Qwen/Qwen3-32B",
+        "model#Meta/Llama-3",
+    }
+
+
+def test_get_cluster_state_returns_instance_lifecycle_fields(state):
+    busy = {
+        "instance_id": "model#Qwen/Qwen3-32B",
+        "provider_instance_id": "i-busy",
+        "model": "Qwen/Qwen3-32B",
+        "status": "busy",
+        "ip": "127.0.0.1",
+        "instance_type": "g5.xlarge",
+        "launch_config_hash": "abc",
+        "launched_at": 1,
+        "started_at": 2,
+        "last_request_at": 3,
+        "active_request_starts": {"3:token"},
+    }
+    warm = {
+        "instance_id": "model#Meta/Llama-3",
+        "provider_instance_id": "i-warm",
+        "model": "Meta/Llama-3",
+        "status": "stopped",
+        "ip": "",
+        "previous_ip": "10.0.0.2",
+        "instance_type": "g5.xlarge",
+        "launched_at": 1,
+        "stopping_at": 4,
+        "stopped_at": 5,
+        "stop_error_at": 4,
+        "warm_expires_at": 6,
+    }
+    state.put_instance(busy)
+    state.put_instance(warm)
+
+    instances = {inst["instance_id"]: inst for inst in get_cluster_state(state)["instances"]}
+
+    assert instances == {busy["instance_id"]: busy, warm["instance_id"]: warm}
+
+
 def test_manual_scale_up_triggers_orchestrator(state):
     triggered = []
 
@@ -50,6 +109,34 @@ def test_manual_scale_up_triggers_orchestrator(state):
     assert triggered == ["Qwen/Qwen3-32B"]
 
 
+def test_manual_scale_up_skips_trigger_while_instance_is_starting(state):
+    state.put_instance(
+        {"instance_id": "model#Qwen/Qwen3-32B", "model": "Qwen/Qwen3-32B", "status": "starting"}
+    )
+    triggered = []
+
+    result = manual_scale(
+        model="Qwen/Qwen3-32B",
+        action="up",
+        state=state,
+        trigger_scale_up=triggered.append,
+    )
+
+    assert result["message"] == "scale-up already in progress"
+    assert triggered == []
+
+
+def test_manual_scale_up_reports_coalesced_trigger(state):
+    result = manual_scale(
+        model="Qwen/Qwen3-32B",
+        action="up",
+        state=state,
+        trigger_scale_up=lambda *_: False,
+    )
+
+    assert result["message"] == "scale-up already requested"
+
+
 def test_manual_scale_down_terminates_one_instance(state):
     state.put_instance(
         {
@@ -0,0 +1,64 @@
+"""Unit tests for the handlers' coalesced scale-up trigger."""
+
+from __future__ import annotations
+
+import pytest
+
+from control_plane.backends.aws import handlers
+from control_plane.shared import config
+
+
+class FakeLambdaClient:
+    def __init__(self):
+        self.invocations: list[dict] = []
+        self.fail_next = False
+
+    def invoke(self, **kwargs):
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("throttled")
+        self.invocations.append(kwargs)
+
+
+@pytest.fixture
+def trigger(monkeypatch):
+    client = FakeLambdaClient()
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(handlers, "_trigger_scale_up", None)
+    monkeypatch.setattr(handlers, "_last_triggered", {})
+    monkeypatch.setattr(handlers, "_aws_client", lambda *args, **kwargs: client)
+    monkeypatch.setattr(handlers.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(config, "ORCHESTRATOR_FUNCTION_NAME", lambda: "orchestrator")
+    return handlers._make_trigger_scale_up(), client, clock
+
+
+def test_repeat_trigger_inside_window_is_skipped(trigger):
+    fire, client, clock = trigger
+
+    assert fire("m") is True
+    clock["now"] += handlers.SCALE_UP_COALESCE_SECONDS - 1
+
+    assert fire("m") is False
+    assert len(client.invocations) == 1
+    assert client.invocations[0]["FunctionName"] == "orchestrator"
+
+
+def test_failed_invoke_clears_marker_so_next_call_invokes(trigger):
+    fire, client, _ = trigger
+    client.fail_next = True
+
+    with pytest.raises(RuntimeError):
+        fire("m")
+
+    assert fire("m") is True
+    assert len(client.invocations) == 1
+
+
+def test_trigger_after_window_expires_invokes_again(trigger):
+    fire, client, clock = trigger
+
+    assert fire("m") is True
+    clock["now"] += handlers.SCALE_UP_COALESCE_SECONDS
+
+    assert fire("m") is True
+    assert len(client.invocations) == 2
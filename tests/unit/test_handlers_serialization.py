@@ -17,6 +17,12 @@ def test_api_response_serializes_decimal_values():
     assert body["util"] == 1.5
 
 
+def test_api_response_serializes_string_sets_as_sorted_lists():
+    response = handlers._api_response(200, {"active_request_starts": {"2:b", "1:a"}})
+
+    assert json.loads(response["body"]) == {"active_request_starts": ["1:a", "2:b"]}
+
+
 def test_api_response_preserves_string_body_for_sse():
     payload = "data: {\"id\":\"chunk-1\"}\n\ndata: [DONE]\n\n"
     response = handlers._api_response(
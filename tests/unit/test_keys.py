@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from control_plane.core import keys
 from control_plane.core.auth import validate_api_key
 from control_plane.core.keys import create_key, delete_key, list_keys
 
@@ -29,6 +30,14 @@ def test_list_keys_returns_only_owner_keys(state):
     assert k1["key_id"] in ids
 
 
+def test_list_keys_returns_newest_first(state, monkeypatch):
+    for created_at, name in ((100, "old"), (300, "new"), (200, "mid")):
+        monkeypatch.setattr(keys.time, "time", lambda: created_at)
+        create_key("a@example.com", name, state)
+
+    assert [k["name"] for k in list_keys("a@example.com", state)] == ["new", "mid", "old"]
+
+
 def test_delete_key_only_deletes_owned_key(state):
     mine = create_key("me@example.com", "mine", state)
     other = create_key("other@example.com", "other", state)
@@ -22,6 +22,45 @@ def test_state_store_instance_crud(state):
     assert len(instances) == 1
 
 
+def test_state_store_instance_indexes_follow_updates(state):
+    state.put_instance({"instance_id": "a", "model": "m1", "status": "starting"})
+    state.put_instance({"instance_id": "b", "model": "m2", "status": "starting"})
+
+    state.update_instance("a", status="ready")
+    state.delete_instance("b")
+
+    assert state.list_instances(status="starting") == []
+    assert [i["instance_id"] for i in state.list_instances(model="m1", status="ready")] == ["a"]
+    assert state.list_instances(model="m2") == []
+
+
+def test_state_store_skips_updates_to_missing_instances(state):
+    state.update_instance("gone", status="ready")
+    state.remove_instance_fields("gone", "ip")
+
+    assert state.get_instance("gone") is None
+    assert state.list_instances(status="ready") == []
+
+
+def test_state_store_filters_by_last_request(state):
+    state.put_instance({"instance_id": "old", "model": "m", "status": "ready", "last_request_at": 10})
+    state.put_instance({"instance_id": "new", "model": "m", "status": "ready", "last_request_at": 90})
+    state.put_instance({"instance_id": "never", "model": "m", "status": "ready"})
+
+    idle = state.list_instances(status="ready", last_request_before=50)
+
+    assert [i["instance_id"] for i in idle] == ["old", "never"]
+
+
+def test_state_store_put_if_absent_overwrites_only_terminated(state):
+    state.put_instance({"instance_id": "m#1", "model": "m", "status": "starting"})
+    assert state.put_instance_if_absent({"instance_id": "m#1", "status": "ready"}) is False
+
+    state.update_instance("m#1", status="terminated")
+    assert state.put_instance_if_absent({"instance_id": "m#1", "model": "m", "status": "starting"})
+    assert state.get_instance("m#1")["status"] == "starting"
+
+
 def test_state_store_model_config(state):
     config = state.get_model_config("Qwen/Qwen3-32B")
     assert config is not None
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import pytest
+
+from control_plane.backends.mock.compute import MockComputeBackend
 from control_plane.core import orchestrator
 
 
@@ -120,12 +123,10 @@ def test_check_health_marks_ready_when_healthy(monkeypatch, state, compute):
         }
     )
 
-    import requests
-
     class MockResp:
         status_code = 200
 
-    monkeypatch.setattr(requests, "get", lambda *a, **kw: MockResp())
+    monkeypatch.setattr(orchestrator._HEALTH_SESSION, "get", lambda *a, **kw: MockResp())
 
     result = orchestrator.check_health(state, compute)
 
@@ -152,7 +153,7 @@ def test_check_health_still_starting_when_unhealthy(monkeypatch, state, compute)
 
     import requests
 
-    monkeypatch.setattr(requests, "get", lambda *a, **kw: (_ for _ in ()).throw(requests.ConnectionError()))
+    monkeypatch.setattr(orchestrator._HEALTH_SESSION, "get", lambda *a, **kw: (_ for _ in ()).throw(requests.ConnectionError()))
 
     result = orchestrator.check_health(state, compute)
 
@@ -160,6 +161,33 @@ def test_check_health_still_starting_when_unhealthy(monkeypatch, state, compute)
     assert state.get_instance("model#Qwen/Qwen3-32B")["status"] == "starting"
 
 
+def test_check_health_backfills_missing_ip_from_provider(monkeypatch, state, compute):
+    now = 10_000
+    monkeypatch.setattr(orchestrator.time, "time", lambda: now)
+
+    state.put_instance(
+        {
+            "instance_id": "model#Qwen/Qwen3-32B",
+            "provider_instance_id": "i-abc",
+            "model": "Qwen/Qwen3-32B",
+            "status": "starting",
+            "ip": "",
+            "instance_type": "g5.xlarge",
+            "launched_at": now - 60,
+            "last_request_at": now - 60,
+        }
+    )
+
+    import requests
+
+    monkeypatch.setattr(orchestrator._HEALTH_SESSION, "get", lambda *a, **kw: (_ for _ in ()).throw(requests.ConnectionError()))
+
+    result = orchestrator.check_health(state, compute)
+
+    assert "model#Qwen/Qwen3-32B" in result["still_starting"]
+    assert state.get_instance("model#Qwen/Qwen3-32B")["ip"] == compute.mock_ip
+
+
 def test_check_health_terminates_on_timeout(monkeypatch, state, compute):
     now = 10_000
     monkeypatch.setattr(orchestrator.time, "time", lambda: now)
@@ -261,6 +289,38 @@ def test_scale_down_terminates_when_warm_timeout_disabled(monkeypatch, state, co
     assert state.get_instance("model#NoWarm/Model")["status"] == "terminated"
 
 
+def test_scale_down_leaves_instance_the_router_claimed_after_listing(monkeypatch, state, compute):
+    now = 10_000
+    monkeypatch.setattr(orchestrator.time, "time", lambda: now)
+    state.put_instance(
+        {
+            "instance_id": "model#Qwen/Qwen3-32B",
+            "provider_instance_id": "i-idle",
+            "model": "Qwen/Qwen3-32B",
+            "status": "ready",
+            "ip": "10.0.0.1",
+            "instance_type": "g5.xlarge",
+            "launched_at": now - 1000,
+            "last_request_at": now - 500,
+        }
+    )
+    list_instances = state.list_instances
+
+    def list_then_claim(**kwargs):
+        listed = [dict(inst) for inst in list_instances(**kwargs)]
+        if kwargs.get("status") == "ready":
+            state.update_instance("model#Qwen/Qwen3-32B", status="busy")
+        return listed
+
+    monkeypatch.setattr(state, "list_instances", list_then_claim)
+
+    result = orchestrator.scale_down(state, compute)
+
+    assert result["stopping"] == []
+    assert compute.stopped == []
+    assert state.get_instance("model#Qwen/Qwen3-32B")["status"] == "busy"
+
+
 def test_scale_down_rolls_back_when_stop_fails(monkeypatch, state, compute):
     now = 10_000
     monkeypatch.setattr(orchestrator.time, "time", lambda: now)
@@ -560,3 +620,67 @@ def test_scale_down_keeps_busy_when_any_request_is_still_active(monkeypatch, sta
 
     assert result == {"stopping": [], "stopped": [], "terminated": []}
     assert state.get_instance("model#Qwen/Qwen3-32B")["status"] == "busy"
+
+
+class FailingComputeBackend(MockComputeBackend):
+    def __init__(self, fail_ids: set[str]):
+        super().__init__()
+        self.fail_ids = fail_ids
+
+    def stop(self, instance_id: str) -> None:
+        if instance_id in self.fail_ids:
+            raise RuntimeError(f"stop failed for {instance_id}")
+        super().stop(instance_id)
+
+    def terminate(self, instance_id: str) -> None:
+        if instance_id in self.fail_ids:
+            raise RuntimeError(f"terminate failed for {instance_id}")
+        super().terminate(instance_id)
+
+
+def test_scale_down_keeps_completed_stops_when_one_stop_fails(state, monkeypatch):
+    now = 10_000
+    monkeypatch.setattr(orchestrator.time, "time", lambda: now)
+    for name in ("a", "b", "c"):
+        state.put_instance(
+            {
+                "instance_id": f"model#{name}",
+                "provider_instance_id": f"i-{name}",
+                "model": "Qwen/Qwen3-32B",
+                "status": "ready",
+                "launched_at": 1,
+                "last_request_at": now - 500,
+            }
+        )
+    compute = FailingComputeBackend({"i-b"})
+
+    with pytest.raises(orchestrator.ScaleDownError) as excinfo:
+        orchestrator.scale_down(state, compute)
+
+    assert excinfo.value.results["stopping"] == ["model#a", "model#c"]
+    assert list(excinfo.value.failures) == ["model#b"]
+    assert sorted(compute.stopped) == ["i-a", "i-c"]
+
+
+def test_scale_down_keeps_completed_terminations_when_one_fails(state, monkeypatch):
+    now = 10_000
+    monkeypatch.setattr(orchestrator.time, "time", lambda: now)
+    for name in ("a", "b"):
+        state.put_instance(
+            {
+                "instance_id": f"model#{name}",
+                "provider_instance_id": f"i-{name}",
+                "model": "Qwen/Qwen3-32B",
+                "status": "stopped",
+                "stopped_at": now - 100,
+                "warm_expires_at": now - 1,
+            }
+        )
+    compute = FailingComputeBackend({"i-a"})
+
+    with pytest.raises(orchestrator.ScaleDownError) as excinfo:
+        orchestrator.scale_down(state, compute)
+
+    assert excinfo.value.results["terminated"] == ["model#b"]
+    assert list(excinfo.value.failures) == ["model#a"]
+    assert state.get_instance("model#b")["status"] == "terminated"